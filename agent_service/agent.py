@@ -305,12 +305,14 @@ You think step by step before acting. For each step:
         
         # Route to appropriate handler
         if tool_name == "semantic_search":
-            results = await retriever.search_with_filters(
+            results = await retriever.search(
                 query=params.get("query", ""),
-                category=params.get("category"),
-                max_price=params.get("max_price"),
-                min_rating=params.get("min_rating"),
                 top_k=params.get("top_k", 5),
+                filter=retriever.build_filter(
+                    category=params.get("category"),
+                    max_price=params.get("max_price"),
+                    min_rating=params.get("min_rating"),
+                ),
             )
             return [{"id": r.product_id, "score": r.score, **r.product} for r in results]
         
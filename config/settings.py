@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     JWT_EXPIRE_DAYS: int = 30
     NODE_ENV: str = "development"
     PAGINATION_LIMIT: int = 12
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024  # 10 MiB per uploaded image
 
     # ──────────────────────────────────────────────────────────────────────────
     # PAYPAL
@@ -50,13 +51,16 @@ class Settings(BaseSettings):
     # ──────────────────────────────────────────────────────────────────────────
     # EMBEDDING SETTINGS
     # ──────────────────────────────────────────────────────────────────────────
-    EMBEDDING_PROVIDER: Literal["openai", "sentence_transformers", "ollama"] = "openai"
+    EMBEDDING_PROVIDER: Literal["openai", "sentence_transformers", "ollama", "fastembed"] = "openai"
     SENTENCE_TRANSFORMERS_MODEL: str = "intfloat/e5-large-v2"
+    FASTEMBED_MODEL: str = "BAAI/bge-small-en-v1.5"  # In-process ONNX, no API call
+    FASTEMBED_THREADS: Optional[int] = None  # None = let ONNX Runtime decide
     
     # Embedding dimensions (must match Pinecone index)
     # OpenAI text-embedding-3-large: 3072
     # OpenAI text-embedding-3-small: 1536
     # Sentence Transformers e5-large-v2: 1024
+    # FastEmbed BAAI/bge-small-en-v1.5: 384
     EMBEDDING_DIMENSION: int = 1536
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -67,6 +71,9 @@ class Settings(BaseSettings):
     PINECONE_NAMESPACE: str = "products"
     PINECONE_CLOUD: str = "aws"
     PINECONE_REGION: str = "us-east-1"
+    # Metric for newly created indexes. Embeddings are L2-normalized before
+    # upsert/query, so dotproduct ranks identically to cosine with less work.
+    PINECONE_METRIC: Literal["cosine", "dotproduct"] = "dotproduct"
 
     # ──────────────────────────────────────────────────────────────────────────
     # RAG SETTINGS
@@ -74,6 +81,10 @@ class Settings(BaseSettings):
     RAG_TOP_K: int = 10  # Number of results to retrieve
     RAG_SIMILARITY_THRESHOLD: float = 0.3  # Minimum similarity score
     RAG_RERANK_ENABLED: bool = True  # Enable reranking
+    RAG_CACHE_TTL_SECONDS: int = 3600  # Semantic response cache entry lifetime
+    RAG_CACHE_SIMILARITY: float = 0.97  # Min cosine similarity for a cache hit
+    RAG_CACHE_MAX_ENTRIES: int = 1000  # Max cached responses per lookup tier
+    RAG_VECTOR_CACHE_MAX_ENTRIES: int = 5000  # Product vectors kept in process for /similar
 
     @property
     def openai_key(self) -> Optional[str]:
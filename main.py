@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -9,16 +9,49 @@ import os
 import signal
 import sys
 import logging
-
-logger = logging.getLogger(__name__)
+import logging.handlers
+import queue
+from typing import Tuple
 
 from config.database import init_db, close_db
 from config.settings import settings
 from services.hybrid_search import hybrid_engine
+from rag_service import embedding_batcher, close_vector_store
 from routers import users_router, products_router, orders_router, upload_router, rag_router, agent_router
 from routers.multi_agent import router as multi_agent_router
 from routers.gateway import router as gateway_router
 
+logger = logging.getLogger(__name__)
+
+
+# Packages whose INFO records (e.g. the upload log lines that replaced
+# print()) should reach the console; the root level is left alone
+_APP_LOGGERS = ("routers", "services", "utils")
+
+
+def _start_queued_logging() -> Tuple[logging.Handler, logging.handlers.QueueListener]:
+    """Route log records through a queue so request handlers never block on stdout"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    
+    for name in _APP_LOGGERS:
+        app_logger = logging.getLogger(name)
+        if app_logger.level == logging.NOTSET:
+            app_logger.setLevel(logging.INFO)
+    # Start draining before records can be queued
+    listener.start()
+    logging.getLogger().addHandler(queue_handler)
+    return queue_handler, listener
+
+
+def _stop_queued_logging(queue_handler: logging.Handler, listener: logging.handlers.QueueListener) -> None:
+    """Detach the queue handler, then flush what it queued"""
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+
 
 # MCP Client for cleanup
 _mcp_client = None
@@ -30,6 +63,7 @@ async def lifespan(app: FastAPI):
     global _mcp_client
     
     # Startup
+    queue_handler, log_listener = _start_queued_logging()
     print("[Startup] Initializing database...")
     await init_db()
     
@@ -48,16 +82,21 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown - cleanup all resources
+    await embedding_batcher.close()
+    await close_vector_store()
+    
     print("\n[Shutdown] Closing database connections...")
     await close_db()
     print("[Shutdown] Cleanup complete!")
+    _stop_queued_logging(queue_handler, log_listener)
 
 
 app = FastAPI(
     title="Tweeky Queeky Shop API",
     description="Modern ecommerce platform API built with FastAPI",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -1,5 +1,6 @@
 from beanie import Document, PydanticObjectId
 from pydantic import Field, ConfigDict, BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from datetime import datetime
 from typing import List, Optional
 
@@ -54,6 +55,12 @@ class Order(Document):
     class Settings:
         name = "orders"
         use_state_management = True
+        # Order lookups the app relies on: per-user listing, newest first, status filters
+        indexes = [
+            IndexModel([("user", ASCENDING)]),
+            IndexModel([("createdAt", DESCENDING)]),
+            IndexModel([("isPaid", ASCENDING), ("isDelivered", ASCENDING)]),
+        ]
 
     async def save(self, *args, **kwargs):
         """Update timestamp on save"""
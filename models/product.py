@@ -1,8 +1,12 @@
 from beanie import Document, PydanticObjectId, Link
 from pydantic import Field, ConfigDict
+from pymongo import ASCENDING, IndexModel
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
+# en/strength 2 compares ignoring case (accents still count)
+CASE_INSENSITIVE_COLLATION = {"locale": "en", "strength": 2}
+
 
 class Review(Document):
     name: str
@@ -54,6 +58,13 @@ class Product(Document):
     class Settings:
         name = "products"
         use_state_management = True
+        # Case-insensitive indexes backing the autocomplete prefix range
+        # scans; queries must pass the same collation to use them
+        indexes = [
+            IndexModel([("name", ASCENDING)], name="name_ci", collation=CASE_INSENSITIVE_COLLATION),
+            IndexModel([("brand", ASCENDING)], name="brand_ci", collation=CASE_INSENSITIVE_COLLATION),
+            IndexModel([("category", ASCENDING)], name="category_ci", collation=CASE_INSENSITIVE_COLLATION),
+        ]
 
     async def save(self, *args, **kwargs):
         """Update timestamp on save"""
@@ -15,11 +15,15 @@ from rag_service.langchain_rag import (
     ProductVectorStore,
     ProductRAGChain,
     get_vector_store,
+    close_vector_store,
     get_rag_chain,
     get_embeddings,
     index_all_products,
     index_single_product,
+    get_index_progress,
 )
+from rag_service.semantic_cache import SemanticCache, semantic_cache, normalize_query
+from rag_service.embed_batcher import EmbeddingBatcher, embedding_batcher
 
 # Legacy custom implementation (kept for reference)
 from rag_service.embeddings import EmbeddingService, embedding_service
@@ -32,10 +36,17 @@ __all__ = [
     "ProductVectorStore",
     "ProductRAGChain",
     "get_vector_store",
+    "close_vector_store",
     "get_rag_chain",
     "get_embeddings",
     "index_all_products",
     "index_single_product",
+    "get_index_progress",
+    "SemanticCache",
+    "semantic_cache",
+    "normalize_query",
+    "EmbeddingBatcher",
+    "embedding_batcher",
     # Legacy (reference)
     "EmbeddingService",
     "embedding_service",
@@ -0,0 +1,108 @@
+"""
+Embedding Batcher - Coalesce concurrent query embeddings into one API call
+
+Concurrent requests each awaiting a single-query embedding would otherwise
+pay one OpenAI round-trip apiece. The batcher collects queries arriving
+within a short window and embeds them with a single batched call.
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from rag_service.langchain_rag import get_embeddings
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching front end for get_embeddings().
+
+    Usage:
+        vector = await embedding_batcher.embed("wireless headphones")
+    """
+
+    def __init__(self, max_batch: int = 64, max_wait_ms: float = 10, timeout_s: float = 30):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        # Backstop so a caller never waits forever on a lost batch
+        self.timeout = timeout_s
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> None:
+        """Start the consumer on first use (per process / event loop)"""
+        # Keep an existing queue: replacing it would strand anything still queued
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed a single query, sharing the API call with concurrent callers"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await asyncio.wait_for(future, self.timeout)
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one item, then drain until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        # Identical queries in the same window share one embedding
+        texts = list(dict.fromkeys(text for text, _ in batch))
+
+        embeddings = get_embeddings()
+        # Local models distinguish query from passage embeddings; OpenAI does not
+        embed_many = getattr(embeddings, "aembed_queries", embeddings.aembed_documents)
+        vectors = await embed_many(texts)
+
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            try:
+                await self._embed_batch(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                # Any failure is the batch's, not the worker's: fail its callers and carry on
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def close(self) -> None:
+        """Stop the consumer task and cancel any queued requests"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+
+
+# Singleton instance shared by the RAG endpoints
+embedding_batcher = EmbeddingBatcher()
@@ -5,6 +5,7 @@ Supports multiple embedding providers:
 - OpenAI (text-embedding-3-large/small)
 - Sentence Transformers (local, free)
 - Ollama (local)
+- FastEmbed (local ONNX)
 """
 
 import asyncio
@@ -66,20 +67,38 @@ class OpenAIEmbedding(BaseEmbeddingProvider):
         )
         return response.data[0].embedding
     
-    async def embed_batch(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
-        """Generate embeddings for multiple texts using OpenAI"""
-        all_embeddings = []
+    async def embed_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 100,
+        max_concurrency: int = 10,
+    ) -> List[List[float]]:
+        """Generate embeddings for multiple texts using OpenAI (batches run concurrently)"""
+        from openai import RateLimitError
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            response = await self._client.embeddings.create(
-                model=self._model,
-                input=batch,
-            )
-            batch_embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(batch_embeddings)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def embed_one_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                for attempt in range(5):
+                    try:
+                        response = await self._client.embeddings.create(
+                            model=self._model,
+                            input=batch,
+                        )
+                        return [item.embedding for item in response.data]
+                    except RateLimitError:
+                        if attempt == 4:
+                            raise
+                        await asyncio.sleep(2 ** attempt)
         
-        return all_embeddings
+        results = await asyncio.gather(*[
+            embed_one_batch(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ])
+        
+        # gather preserves order, so flattening keeps embeddings aligned with texts
+        return [embedding for batch in results for embedding in batch]
 
 
 class SentenceTransformersEmbedding(BaseEmbeddingProvider):
@@ -122,6 +141,41 @@ class SentenceTransformersEmbedding(BaseEmbeddingProvider):
         return embeddings
 
 
+class FastEmbedEmbedding(BaseEmbeddingProvider):
+    """FastEmbed embedding provider (local ONNX, free)"""
+    
+    def __init__(self):
+        try:
+            from fastembed import TextEmbedding
+        except ImportError:
+            raise ImportError(
+                "fastembed not installed. "
+                "Run: pip install fastembed"
+            )
+        
+        self._model = TextEmbedding(
+            model_name=settings.FASTEMBED_MODEL,
+            threads=settings.FASTEMBED_THREADS,
+        )
+        self._dimension = settings.EMBEDDING_DIMENSION
+    
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+    
+    async def embed(self, text: str) -> List[float]:
+        """Generate a query embedding using FastEmbed"""
+        return await asyncio.to_thread(
+            lambda: next(iter(self._model.query_embed([text]))).tolist()
+        )
+    
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate passage embeddings for multiple texts"""
+        return await asyncio.to_thread(
+            lambda: [vec.tolist() for vec in self._model.passage_embed(texts)]
+        )
+
+
 class OllamaEmbedding(BaseEmbeddingProvider):
     """Ollama embedding provider (local)"""
     
@@ -172,7 +226,7 @@ class EmbeddingService:
         Initialize embedding service.
         
         Args:
-            provider: Override provider from settings ('openai', 'sentence_transformers', 'ollama')
+            provider: Override provider from settings ('openai', 'sentence_transformers', 'ollama', 'fastembed')
         """
         self._provider_name = provider or settings.EMBEDDING_PROVIDER
         self._provider: Optional[BaseEmbeddingProvider] = None
@@ -186,6 +240,8 @@ class EmbeddingService:
                 self._provider = SentenceTransformersEmbedding()
             elif self._provider_name == "ollama":
                 self._provider = OllamaEmbedding()
+            elif self._provider_name == "fastembed":
+                self._provider = FastEmbedEmbedding()
             else:
                 raise ValueError(f"Unknown embedding provider: {self._provider_name}")
         return self._provider
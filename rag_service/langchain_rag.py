@@ -8,27 +8,89 @@ Uses LangChain ecosystem for:
 - Document processing
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_pinecone import PineconeVectorStore
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough, RunnableParallel
 from pinecone import Pinecone, ServerlessSpec
+from openai import RateLimitError
 import asyncio
+import numpy as np
+from datetime import datetime
 from functools import lru_cache
 
 from config.settings import settings
+from rag_service.vector_cache import ProductVectorCache
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # EMBEDDINGS
 # ─────────────────────────────────────────────────────────────────────────────
 
+def l2_normalize(vectors: List[List[float]]) -> List[List[float]]:
+    """Scale each vector to unit length so dot product equals cosine similarity"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1, norms)).tolist()
+
+
+def l2_normalize_one(vector: List[float]) -> List[float]:
+    """l2_normalize for a single (query) vector"""
+    return l2_normalize([vector])[0]
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """
+    LangChain adapter for FastEmbed's in-process ONNX models.
+    
+    Removes the network round-trip from query embedding. Documents must be
+    indexed with the same model (and EMBEDDING_DIMENSION set to match).
+    The model is loaded on first use, not at import.
+    """
+    
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        self.model_name = model_name
+        self.threads = threads
+        self._model = None
+    
+    def _get_model(self):
+        if self._model is None:
+            try:
+                from fastembed import TextEmbedding
+            except ImportError:
+                raise ImportError(
+                    "fastembed not installed. "
+                    "Run: pip install fastembed"
+                )
+            self._model = TextEmbedding(model_name=self.model_name, threads=self.threads)
+        return self._model
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return l2_normalize(list(self._get_model().passage_embed(texts)))
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+    
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries (with the model's query instruction) in one pass"""
+        return l2_normalize(list(self._get_model().query_embed(texts)))
+    
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.embed_queries, texts)
+
+
 @lru_cache()
-def get_embeddings() -> OpenAIEmbeddings:
-    """Get cached OpenAI embeddings instance"""
+def get_embeddings() -> Embeddings:
+    """Get cached embeddings instance for the configured provider"""
+    if settings.EMBEDDING_PROVIDER == "fastembed":
+        return FastEmbedEmbeddings(
+            model_name=settings.FASTEMBED_MODEL,
+            threads=settings.FASTEMBED_THREADS,
+        )
     return OpenAIEmbeddings(
         model=settings.OPENAI_EMBEDDING_MODEL,
         openai_api_key=settings.OPENAI_API_KEY,
@@ -58,6 +120,8 @@ class ProductVectorStore:
         self.index_name = settings.PINECONE_INDEX
         self.namespace = settings.PINECONE_NAMESPACE
         self._vector_store: Optional[PineconeVectorStore] = None
+        self._async_index = None
+        self.vector_cache = ProductVectorCache()
     
     @classmethod
     def get_instance(cls) -> "ProductVectorStore":
@@ -74,7 +138,7 @@ class ProductVectorStore:
             self.pc.create_index(
                 name=self.index_name,
                 dimension=settings.EMBEDDING_DIMENSION,
-                metric="cosine",
+                metric=settings.PINECONE_METRIC,
                 spec=ServerlessSpec(
                     cloud=settings.PINECONE_CLOUD,
                     region=settings.PINECONE_REGION,
@@ -136,8 +200,13 @@ class ProductVectorStore:
             documents.append(doc)
         
         if documents:
-            # Use add_documents for batch upsert
-            self.store.add_documents(documents)
+            self.vector_cache.discard(doc.metadata["product_id"] for doc in documents)
+            # Use add_documents for batch upsert; keying vectors by product ID
+            # makes re-indexing idempotent and lets callers fetch a product's vector
+            self.store.add_documents(
+                documents,
+                ids=[doc.metadata["product_id"] for doc in documents],
+            )
         
         return len(documents)
     
@@ -196,6 +265,19 @@ class ProductVectorStore:
             filter=filter_dict,
         )
     
+    def search_with_scores_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[Document, float]]:
+        """Search with relevance scores using a precomputed query embedding"""
+        return self.store.similarity_search_by_vector_with_score(
+            embedding=l2_normalize_one(embedding),
+            k=k,
+            filter=filter_dict,
+        )
+    
     def get_retriever(self, k: int = 5, filter_dict: Optional[Dict[str, Any]] = None):
         """Get a retriever for use in chains"""
         search_kwargs = {"k": k}
@@ -205,17 +287,106 @@ class ProductVectorStore:
     
     def delete_by_ids(self, ids: List[str]) -> None:
         """Delete documents by ID"""
+        self.vector_cache.discard(ids)
         self.store.delete(ids=ids)
     
+    def delete_stale(self, keep_ids: Set[str]) -> int:
+        """
+        Delete every vector in the namespace whose ID is not in keep_ids.
+        
+        Catches legacy random-UUID vectors (written before vectors were keyed
+        by product ID) and vectors of products that no longer exist.
+        
+        Returns:
+            Number of vectors deleted
+        """
+        index = self.pc.Index(self.index_name)
+        stale = [
+            vector_id
+            for page in index.list(namespace=self.namespace)
+            for vector_id in page
+            if vector_id not in keep_ids
+        ]
+        # Pinecone caps a delete request at 1000 IDs
+        for i in range(0, len(stale), 1000):
+            index.delete(ids=stale[i:i + 1000], namespace=self.namespace)
+        self.vector_cache.discard(stale)
+        return len(stale)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get index statistics"""
         index = self.pc.Index(self.index_name)
         stats = index.describe_index_stats()
+        return self._format_stats(stats)
+    
+    @staticmethod
+    def _format_stats(stats) -> Dict[str, Any]:
         return {
             "total_vectors": stats.total_vector_count,
             "namespaces": dict(stats.namespaces) if stats.namespaces else {},
             "dimension": stats.dimension,
         }
+    
+    # ── Async (PineconeAsyncio) API for request handlers ────────────────────
+    
+    async def _get_async_index(self):
+        """Get the asyncio index client, resolving the index host once"""
+        if self._async_index is None:
+            # One-time setup (index creation / host lookup) is sync in the SDK
+            await asyncio.to_thread(self._ensure_index)
+            description = await asyncio.to_thread(self.pc.describe_index, self.index_name)
+            self._async_index = self.pc.IndexAsyncio(host=description.host)
+        return self._async_index
+    
+    async def asearch_with_scores_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[Document, float]]:
+        """Async search with relevance scores using a precomputed query embedding"""
+        index = await self._get_async_index()
+        response = await index.query(
+            vector=l2_normalize_one(embedding),
+            top_k=k,
+            namespace=self.namespace,
+            filter=filter_dict,
+            include_metadata=True,
+        )
+        
+        results = []
+        for match in response.matches:
+            metadata = dict(match.metadata or {})
+            # PineconeVectorStore keeps the page content under the "text" key
+            text = metadata.pop("text", "")
+            results.append((Document(page_content=text, metadata=metadata), match.score))
+        return results
+    
+    async def afetch_vector(self, vector_id: str) -> Optional[List[float]]:
+        """Fetch a stored vector by ID (product ID), or None if not indexed"""
+        cached = self.vector_cache.get(vector_id)
+        if cached is not None:
+            return cached
+        
+        index = await self._get_async_index()
+        response = await index.fetch(ids=[vector_id], namespace=self.namespace)
+        vector = (response.vectors or {}).get(vector_id)
+        if not vector:
+            return None
+        self.vector_cache.put(vector_id, vector.values)
+        return list(vector.values)
+    
+    async def aget_stats(self) -> Dict[str, Any]:
+        """Get index statistics without blocking the event loop"""
+        index = await self._get_async_index()
+        stats = await index.describe_index_stats()
+        return self._format_stats(stats)
+    
+    async def aclose(self) -> None:
+        """Close the asyncio index client"""
+        if self._async_index is not None:
+            await self._async_index.close()
+            self._async_index = None
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -245,8 +416,8 @@ class ProductRAGChain:
             openai_api_key=settings.OPENAI_API_KEY,
         )
     
-    def _create_qa_chain(self, retriever):
-        """Create a Q&A chain using LCEL"""
+    def _create_answer_chain(self):
+        """Create the prompt -> llm -> parse chain (context supplied by caller)"""
         system_prompt = """You are a helpful shopping assistant for TweekySqueeky Shop.
 Answer the question based ONLY on the following product information.
 If you cannot answer from the context, say so politely.
@@ -266,15 +437,17 @@ Guidelines:
             ("human", "{question}"),
         ])
         
+        return prompt | self.llm | StrOutputParser()
+    
+    def _create_qa_chain(self, retriever):
+        """Create a Q&A chain using LCEL"""
         # LCEL chain: retrieve docs -> format -> prompt -> llm -> parse
         chain = (
             RunnableParallel(
                 context=retriever | _format_docs,
                 question=RunnablePassthrough(),
             )
-            | prompt
-            | self.llm
-            | StrOutputParser()
+            | self._create_answer_chain()
         )
         
         return chain
@@ -284,27 +457,31 @@ Guidelines:
         question: str,
         k: int = 5,
         filter_dict: Optional[Dict[str, Any]] = None,
+        question_embedding: Optional[List[float]] = None,
     ) -> Dict[str, Any]:
         """
         Ask a question about products.
         
+        Retrieves context once (async Pinecone query) and feeds the same
+        documents to the LLM, instead of retrieving again inside the chain.
+        
         Returns:
             Dict with 'answer' and 'source_documents'
         """
-        retriever = self.vector_store.get_retriever(k=k, filter_dict=filter_dict)
+        if question_embedding is None:
+            question_embedding = await self.vector_store.embeddings.aembed_query(question)
         
-        # Get documents first for source tracking
-        docs = await asyncio.to_thread(
-            retriever.invoke,
-            question
+        results = await self.vector_store.asearch_with_scores_by_vector(
+            embedding=question_embedding,
+            k=k,
+            filter_dict=filter_dict,
         )
+        docs = [doc for doc, _ in results]
         
-        # Create and run chain
-        chain = self._create_qa_chain(retriever)
-        answer = await asyncio.to_thread(
-            chain.invoke,
-            question
-        )
+        answer = await self._create_answer_chain().ainvoke({
+            "context": _format_docs(docs),
+            "question": question,
+        })
         
         return {
             "answer": answer,
@@ -325,13 +502,72 @@ Guidelines:
         max_price: Optional[float] = None,
         category: Optional[str] = None,
         min_rating: Optional[float] = None,
+        query_embedding: Optional[List[float]] = None,
+        exclude_product_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search products with optional filters.
         
+        If query_embedding is given it is used directly instead of
+        re-embedding the query text. exclude_product_id is filtered out
+        inside the Pinecone query, so k results still come back.
+        
         Returns product metadata and relevance scores.
         """
-        # Build Pinecone filter
+        filter_dict = self._build_filter(
+            min_price, max_price, category, min_rating, exclude_product_id
+        )
+        
+        # Search with scores
+        if query_embedding is not None:
+            results = self.vector_store.search_with_scores_by_vector(
+                embedding=query_embedding,
+                k=k,
+                filter_dict=filter_dict,
+            )
+        else:
+            results = self.vector_store.search_with_scores(
+                query=query,
+                k=k,
+                filter_dict=filter_dict,
+            )
+        
+        return [self._to_result(doc, score) for doc, score in results]
+    
+    async def asearch_products(
+        self,
+        query: str,
+        k: int = 5,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        category: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        query_embedding: Optional[List[float]] = None,
+        exclude_product_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async version of search_products using the asyncio Pinecone client"""
+        if query_embedding is None:
+            query_embedding = await self.vector_store.embeddings.aembed_query(query)
+        
+        results = await self.vector_store.asearch_with_scores_by_vector(
+            embedding=query_embedding,
+            k=k,
+            filter_dict=self._build_filter(
+                min_price, max_price, category, min_rating, exclude_product_id
+            ),
+        )
+        
+        return [self._to_result(doc, score) for doc, score in results]
+    
+    @staticmethod
+    def _build_filter(
+        min_price: Optional[float],
+        max_price: Optional[float],
+        category: Optional[str],
+        min_rating: Optional[float],
+        exclude_product_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Build a Pinecone metadata filter from the search options"""
         filter_conditions = []
         
         if min_price is not None:
@@ -342,34 +578,28 @@ Guidelines:
             filter_conditions.append({"category": {"$eq": category}})
         if min_rating is not None:
             filter_conditions.append({"rating": {"$gte": min_rating}})
+        if exclude_product_id:
+            filter_conditions.append({"product_id": {"$ne": exclude_product_id}})
         
-        filter_dict = None
-        if filter_conditions:
-            if len(filter_conditions) == 1:
-                filter_dict = filter_conditions[0]
-            else:
-                filter_dict = {"$and": filter_conditions}
-        
-        # Search with scores
-        results = self.vector_store.search_with_scores(
-            query=query,
-            k=k,
-            filter_dict=filter_dict,
-        )
-        
-        return [
-            {
-                "product_id": doc.metadata.get("product_id"),
-                "name": doc.metadata.get("name"),
-                "brand": doc.metadata.get("brand"),
-                "category": doc.metadata.get("category"),
-                "price": doc.metadata.get("price"),
-                "rating": doc.metadata.get("rating"),
-                "score": 1 - score,  # Convert distance to similarity
-                "content": doc.page_content,
-            }
-            for doc, score in results
-        ]
+        if not filter_conditions:
+            return None
+        if len(filter_conditions) == 1:
+            return filter_conditions[0]
+        return {"$and": filter_conditions}
+    
+    @staticmethod
+    def _to_result(doc: Document, score: float) -> Dict[str, Any]:
+        """Convert a scored document into the search result shape"""
+        return {
+            "product_id": doc.metadata.get("product_id"),
+            "name": doc.metadata.get("name"),
+            "brand": doc.metadata.get("brand"),
+            "category": doc.metadata.get("category"),
+            "price": doc.metadata.get("price"),
+            "rating": doc.metadata.get("rating"),
+            "score": 1 - score,  # Convert distance to similarity
+            "content": doc.page_content,
+        }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -381,6 +611,12 @@ def get_vector_store() -> ProductVectorStore:
     return ProductVectorStore.get_instance()
 
 
+async def close_vector_store() -> None:
+    """Release async clients held by the vector store, if it was ever created"""
+    if ProductVectorStore._instance is not None:
+        await ProductVectorStore._instance.aclose()
+
+
 def get_rag_chain() -> ProductRAGChain:
     """Get a RAG chain instance"""
     return ProductRAGChain(get_vector_store())
@@ -390,13 +626,58 @@ def get_rag_chain() -> ProductRAGChain:
 # INDEXING FUNCTIONS
 # ─────────────────────────────────────────────────────────────────────────────
 
+INDEX_BATCH_SIZE = 100
+INDEX_MAX_CONCURRENCY = 10
+INDEX_MAX_RETRIES = 5
+
+
+async def _with_rate_limit_retry(func, *args):
+    """Run a blocking call in a thread, backing off exponentially on 429s"""
+    for attempt in range(INDEX_MAX_RETRIES):
+        try:
+            return await asyncio.to_thread(func, *args)
+        except RateLimitError:
+            if attempt == INDEX_MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(2 ** attempt)
+
+
+# Progress of the most recent full re-index (per process), polled via /index/stats
+_index_progress: Dict[str, Any] = {"status": "idle", "indexed": 0, "total": 0}
+
+
+def get_index_progress() -> Dict[str, Any]:
+    """Get a snapshot of the current/last full re-index progress"""
+    return dict(_index_progress)
+
+
 async def index_all_products() -> Dict[str, Any]:
     """
     Index all products from the database into the vector store.
     
+    Progress is recorded for get_index_progress() as batches complete.
+    
     Returns:
         Stats about the indexing operation
     """
+    _index_progress.update(
+        status="running", indexed=0, total=0, error=None,
+        started_at=datetime.utcnow().isoformat(), finished_at=None,
+    )
+    try:
+        result = await _index_all_products()
+    except Exception as e:
+        _index_progress.update(status="error", error=str(e), finished_at=datetime.utcnow().isoformat())
+        raise
+    _index_progress.update(
+        status=result["status"],
+        error=result.get("message"),
+        finished_at=datetime.utcnow().isoformat(),
+    )
+    return result
+
+
+async def _index_all_products() -> Dict[str, Any]:
     from services.product_service import product_service
     
     # Get all products as Beanie documents
@@ -431,11 +712,28 @@ async def index_all_products() -> Dict[str, Any]:
     if not products:
         return {"status": "error", "message": "No products found"}
     
-    # Index them
+    # Index batches concurrently (embedding + upsert are I/O bound), capped
+    # so we stay within the embedding API's rate limits
     vector_store = get_vector_store()
-    count = await asyncio.to_thread(
-        vector_store.index_products,
-        products
+    _index_progress["total"] = len(products)
+    semaphore = asyncio.Semaphore(INDEX_MAX_CONCURRENCY)
+    
+    async def index_batch(batch: List[Dict[str, Any]]) -> int:
+        async with semaphore:
+            indexed = await _with_rate_limit_retry(vector_store.index_products, batch)
+        _index_progress["indexed"] += indexed
+        return indexed
+    
+    counts = await asyncio.gather(*[
+        index_batch(products[i:i + INDEX_BATCH_SIZE])
+        for i in range(0, len(products), INDEX_BATCH_SIZE)
+    ])
+    count = sum(counts)
+    
+    # Upserts are keyed by product ID, so search keeps serving while they run;
+    # only once every batch landed drop what they did not overwrite
+    stale_removed = await asyncio.to_thread(
+        vector_store.delete_stale, {str(p.id) for p in products_raw}
     )
     
     # Get stats
@@ -444,6 +742,7 @@ async def index_all_products() -> Dict[str, Any]:
     return {
         "status": "success",
         "products_indexed": count,
+        "stale_vectors_removed": stale_removed,
         "total_vectors": stats.get("total_vectors", 0),
         "index_name": vector_store.index_name,
         "namespace": vector_store.namespace,
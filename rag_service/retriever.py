@@ -54,10 +54,9 @@ class RAGRetriever:
     Usage:
         retriever = RAGRetriever()
         results = await retriever.search("comfortable office chair under $300")
-        results = await retriever.search_with_filters(
+        results = await retriever.search(
             query="gaming accessories",
-            category="Electronics",
-            max_price=200
+            filter=RAGRetriever.build_filter(category="Electronics", max_price=200),
         )
     """
     
@@ -75,6 +74,7 @@ class RAGRetriever:
         top_k: int = None,
         min_score: float = None,
         include_products: bool = True,
+        filter: Optional[Dict[str, Any]] = None,
     ) -> List[RetrievalResult]:
         """
         Semantic search for products.
@@ -84,6 +84,7 @@ class RAGRetriever:
             top_k: Number of results (default from settings)
             min_score: Minimum similarity score (default from settings)
             include_products: Whether to fetch full product data
+            filter: Pinecone metadata filter (see build_filter)
             
         Returns:
             List of RetrievalResult with matched products
@@ -98,6 +99,7 @@ class RAGRetriever:
         search_results = await self._store.search(
             query_vector=query_embedding,
             top_k=top_k,
+            filter=filter,
             include_metadata=True,
         )
         
@@ -126,76 +128,36 @@ class RAGRetriever:
         
         return results
     
-    async def search_with_filters(
-        self,
-        query: str,
+    @staticmethod
+    def build_filter(
         category: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         min_rating: Optional[float] = None,
         in_stock_only: bool = False,
-        top_k: int = None,
-    ) -> List[RetrievalResult]:
+    ) -> Optional[Dict[str, Any]]:
         """
-        Semantic search with metadata filters.
+        Build a composite Pinecone metadata filter.
+        
+        All predicates go into one $and so they are applied during the
+        vector search itself, in a single query.
         
-        Args:
-            query: Natural language search query
-            category: Filter by category
-            min_price: Minimum price
-            max_price: Maximum price
-            min_rating: Minimum rating
-            in_stock_only: Only return in-stock products
-            top_k: Number of results
-            
         Returns:
-            List of filtered RetrievalResult
+            Filter dict, or None if no filter is set
         """
-        top_k = top_k or settings.RAG_TOP_K
-        
-        # Build Pinecone filter
-        pinecone_filter = {}
-        
+        clauses = []
         if category:
-            pinecone_filter["category"] = {"$eq": category}
-        
+            clauses.append({"category": {"$eq": category}})
         if min_price is not None:
-            pinecone_filter["price"] = pinecone_filter.get("price", {})
-            pinecone_filter["price"]["$gte"] = min_price
-        
+            clauses.append({"price": {"$gte": min_price}})
         if max_price is not None:
-            pinecone_filter["price"] = pinecone_filter.get("price", {})
-            pinecone_filter["price"]["$lte"] = max_price
-        
+            clauses.append({"price": {"$lte": max_price}})
         if min_rating is not None:
-            pinecone_filter["rating"] = {"$gte": min_rating}
-        
+            clauses.append({"rating": {"$gte": min_rating}})
         if in_stock_only:
-            pinecone_filter["count_in_stock"] = {"$gt": 0}
-        
-        # Generate query embedding
-        query_embedding = await self._embeddings.embed(query)
+            clauses.append({"count_in_stock": {"$gt": 0}})
         
-        # Search with filters
-        search_results = await self._store.search(
-            query_vector=query_embedding,
-            top_k=top_k * 2,  # Fetch more for post-filtering
-            filter=pinecone_filter if pinecone_filter else None,
-            include_metadata=True,
-        )
-        
-        # Build results with full product data
-        results = []
-        for sr in search_results[:top_k]:
-            product_data = await product_service.get_product(sr.id)
-            
-            results.append(RetrievalResult(
-                product_id=sr.id,
-                score=sr.score,
-                product=product_data or sr.metadata,
-            ))
-        
-        return results
+        return {"$and": clauses} if clauses else None
     
     async def find_similar_products(
         self,
@@ -0,0 +1,204 @@
+"""
+Semantic Response Cache - Short-circuit repeat RAG queries
+
+Two lookup tiers, both in-process:
+- Exact: normalized query text + request parameters
+- Semantic: cosine similarity of the query embedding against cached queries
+  that were issued with the same request parameters
+
+A hit skips the vector search (and, for Q&A, the LLM call) entirely.
+"""
+
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+
+
+_PUNCTUATION = re.compile(r"[^\w\s$.]")
+_WHITESPACE = re.compile(r"\s+")
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "please", "can", "you", "could", "would",
+    "me", "show", "find", "i", "want", "need", "some", "any",
+})
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, strip punctuation and filler words, collapse whitespace"""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    words = [w for w in _WHITESPACE.split(text.strip()) if w and w not in _FILLER_WORDS]
+    return " ".join(words)
+
+
+class SemanticCache:
+    """
+    TTL-expiring, LRU-evicted response cache keyed by exact text and by embedding similarity.
+
+    Each tier holds at most max_entries payloads in total, however many
+    scopes (request-parameter combinations) they are spread over; the least
+    recently used entry is evicted first and a scope disappears with its
+    last entry. Expired entries are swept on every lookup and insert.
+
+    Usage:
+        cache = SemanticCache()
+        hit = cache.get_exact(("search", "office chair", 10))
+        hit = cache.get_similar(query_embedding, scope=("search", 10))
+        cache.put(payload, exact_key=key, embedding=emb, scope=("search", 10))
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        similarity_threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.ttl_seconds = settings.RAG_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.similarity_threshold = (
+            settings.RAG_CACHE_SIMILARITY if similarity_threshold is None else similarity_threshold
+        )
+        self.max_entries = settings.RAG_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+        # exact_key -> (expires_at, payload), least recently used first
+        self._exact: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # entry id -> (scope, expires_at, unit embedding, payload), least recently used first
+        self._semantic: "OrderedDict[int, Tuple[Hashable, float, np.ndarray, Any]]" = OrderedDict()
+        # scope -> ids of its entries, in the row order of _matrices[scope]
+        self._scopes: Dict[Hashable, List[int]] = {}
+        # scope -> stacked embeddings of its entries; dropped whenever the
+        # scope changes so lookups don't re-stack on every call
+        self._matrices: Dict[Hashable, np.ndarray] = {}
+        # (expires_at, tier, key) in insertion order; with one TTL for every
+        # entry that is also expiry order, so sweeping pops from the left
+        self._expiry: Deque[Tuple[float, str, Hashable]] = deque()
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_exact(self, key: Hashable) -> Optional[Any]:
+        """Look up a payload by exact key"""
+        self._sweep_expired()
+        entry = self._exact.get(key)
+        if entry is not None:
+            self._exact.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def get_similar(self, embedding: List[float], scope: Hashable) -> Optional[Any]:
+        """Look up the closest cached payload in scope above the similarity threshold"""
+        self._sweep_expired()
+        ids = self._scopes.get(scope)
+        if ids:
+            matrix = self._matrices.get(scope)
+            if matrix is None:
+                matrix = self._matrices[scope] = np.stack([self._semantic[i][2] for i in ids])
+            scores = matrix @ _unit(embedding)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                entry_id = ids[best]
+                self._semantic.move_to_end(entry_id)
+                self.hits += 1
+                return self._semantic[entry_id][3]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        payload: Any,
+        exact_key: Optional[Hashable] = None,
+        embedding: Optional[List[float]] = None,
+        scope: Optional[Hashable] = None,
+    ) -> None:
+        """Store a payload under an exact key and/or an embedding within a scope"""
+        self._sweep_expired()
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        if exact_key is not None:
+            self._exact[exact_key] = (expires_at, payload)
+            self._exact.move_to_end(exact_key)
+            self._expiry.append((expires_at, "exact", exact_key))
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+        if embedding is not None and scope is not None:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._semantic[entry_id] = (scope, expires_at, _unit(embedding), payload)
+            self._scopes.setdefault(scope, []).append(entry_id)
+            self._matrices.pop(scope, None)
+            self._expiry.append((expires_at, "semantic", entry_id))
+            while len(self._semantic) > self.max_entries:
+                self._drop_semantic(next(iter(self._semantic)))
+
+        # Entries evicted by LRU leave stale expiry records behind; compact
+        # once they outnumber the live ones
+        if len(self._expiry) > 2 * (len(self._exact) + len(self._semantic)) + 64:
+            self._expiry = deque(
+                record for record in self._expiry if self._is_live(*record)
+            )
+
+    def clear(self) -> None:
+        """Drop all cached payloads (e.g. after re-indexing)"""
+        self._exact.clear()
+        self._semantic.clear()
+        self._scopes.clear()
+        self._matrices.clear()
+        self._expiry.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "exact_entries": len(self._exact),
+            "semantic_entries": len(self._semantic),
+            "semantic_scopes": len(self._scopes),
+        }
+
+    def _is_live(self, expires_at: float, tier: str, key: Hashable) -> bool:
+        """Whether an expiry record still refers to a cached entry"""
+        if tier == "exact":
+            entry = self._exact.get(key)
+            current = entry[0] if entry is not None else None
+        else:
+            entry = self._semantic.get(key)
+            current = entry[1] if entry is not None else None
+        # A re-put exact key has a newer record of its own
+        return current == expires_at
+
+    def _sweep_expired(self) -> None:
+        """Remove every entry whose TTL has passed, across all scopes"""
+        now = time.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, tier, key = self._expiry.popleft()
+            if not self._is_live(expires_at, tier, key):
+                continue
+            if tier == "exact":
+                del self._exact[key]
+            else:
+                self._drop_semantic(key)
+
+    def _drop_semantic(self, entry_id: int) -> None:
+        """Remove one semantic entry, and its scope once that is empty"""
+        scope = self._semantic.pop(entry_id)[0]
+        ids = self._scopes[scope]
+        ids.remove(entry_id)
+        self._matrices.pop(scope, None)
+        if not ids:
+            del self._scopes[scope]
+
+
+def _unit(embedding: List[float]) -> np.ndarray:
+    """L2-normalize an embedding so a dot product is cosine similarity"""
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# Singleton instance shared by the RAG endpoints
+semantic_cache = SemanticCache()
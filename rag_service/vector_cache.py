@@ -0,0 +1,74 @@
+"""
+Product Vector Cache - Keep fetched product embeddings in process
+
+/similar starts from the source product's stored vector. Fetching it from
+Pinecone on every request costs a network round-trip; the same popular
+products are looked up over and over, so recent vectors are kept here.
+
+Vectors are stored int8-quantized with a per-vector scale: a quarter of the
+FP32 footprint, and the rounding error is far below what changes a top-k
+ranking.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+
+
+class ProductVectorCache:
+    """
+    LRU-bounded cache of product embeddings keyed by product ID.
+
+    Usage:
+        cache = ProductVectorCache()
+        cache.put("65f1...", vector)
+        vector = cache.get("65f1...")
+        cache.discard(["65f1..."])  # after the product is re-indexed
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = settings.RAG_VECTOR_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        # product_id -> (int8 codes, scale)
+        self._vectors: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+
+    def get(self, product_id: str) -> Optional[List[float]]:
+        """Return the cached vector, or None on a miss"""
+        entry = self._vectors.get(product_id)
+        if entry is None:
+            return None
+        self._vectors.move_to_end(product_id)
+        return dequantize_int8(*entry).tolist()
+
+    def put(self, product_id: str, vector: List[float]) -> None:
+        """Cache a product's vector, evicting the least recently used"""
+        self._vectors[product_id] = quantize_int8(vector)
+        self._vectors.move_to_end(product_id)
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+    def discard(self, product_ids: Iterable[str]) -> None:
+        """Drop vectors that are about to change"""
+        for product_id in product_ids:
+            self._vectors.pop(product_id, None)
+
+    def clear(self) -> None:
+        self._vectors.clear()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+
+def quantize_int8(vector: List[float]) -> Tuple[np.ndarray, float]:
+    """Symmetric scalar quantization: int8 codes plus the scale to undo it"""
+    vec = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.max(np.abs(vec))) if vec.size else 0.0
+    scale = max_abs / 127 if max_abs else 1.0
+    return np.round(vec / scale).astype(np.int8), scale
+
+
+def dequantize_int8(codes: np.ndarray, scale: float) -> np.ndarray:
+    """Approximate FP32 vector from int8 codes"""
+    return codes.astype(np.float32) * scale
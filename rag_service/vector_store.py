@@ -70,7 +70,7 @@ class PineconeStore:
             self._pc.create_index(
                 name=index_name,
                 dimension=settings.EMBEDDING_DIMENSION,
-                metric="cosine",
+                metric=settings.PINECONE_METRIC,
                 spec=ServerlessSpec(
                     cloud=settings.PINECONE_CLOUD,
                     region=settings.PINECONE_REGION,
@@ -281,10 +281,10 @@ async def quick_search(
     from rag_service.retriever import RAGRetriever
     
     retriever = RAGRetriever()
-    results = await retriever.search_with_filters(
+    results = await retriever.search(
         query=q,
-        max_price=max_price,
         top_k=limit,
+        filter=retriever.build_filter(max_price=max_price),
     )
     
     return {
@@ -312,10 +312,10 @@ async def quick_recommend(
     from rag_service.retriever import RAGRetriever
     
     retriever = RAGRetriever()
-    results = await retriever.search_with_filters(
+    results = await retriever.search(
         query=preferences,
-        max_price=budget,
         top_k=limit,
+        filter=retriever.build_filter(max_price=budget),
     )
     
     return {
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from models.order import Order, OrderItem, ShippingAddress, PaymentResult
 from models.product import Product
 from models.user import User
@@ -7,16 +8,43 @@ from middleware.auth import get_current_user, require_admin
 from utils.calc_prices import calc_prices
 from utils.paypal import verify_paypal_payment, check_if_new_transaction
 from utils.stripe_utils import create_stripe_payment_intent, verify_stripe_payment
-from utils.order_serializer import serialize_order
-from typing import List
+from utils.order_serializer import serialize_order, orders_json
+from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
+# Order lists are encoded by orders_json rather than validated through a
+# response_model; this only documents their shape in OpenAPI
+_ORDER_LIST_RESPONSES = {
+    200: {"model": List[OrderResponse], "description": "Orders as a JSON array"},
+}
+
+
+def _parse_order_id(order_id: str) -> ObjectId:
+    """Convert a path order ID to ObjectId, mapping malformed IDs to 404"""
+    try:
+        return ObjectId(order_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+
+
+async def _find_one_and_update_order(filter_doc: dict, update_doc: dict) -> Optional[Order]:
+    """Apply an atomic update and return the updated Order, or None if nothing matched"""
+    doc = await Order.get_motor_collection().find_one_and_update(
+        filter_doc, update_doc, return_document=ReturnDocument.AFTER
+    )
+    return Order.model_validate(doc) if doc else None
+
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def add_order_items(
@@ -24,10 +52,11 @@ async def add_order_items(
     current_user: User = Depends(get_current_user)
 ):
     """Create new order"""
-    logger.info(f"[ORDER CREATE] Parsed order_data: items={len(order_data.order_items)}, "
-                f"shipping={order_data.shipping_address}, payment={order_data.payment_method}")
-    for i, item in enumerate(order_data.order_items):
-        logger.info(f"[ORDER CREATE] Item {i}: name={item.name}, qty={item.qty}, price={item.price}, product={item.product}")
+    logger.info("[ORDER CREATE] Parsed order_data: items=%d, shipping=%s, payment=%s",
+                len(order_data.order_items), order_data.shipping_address, order_data.payment_method)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[ORDER CREATE] Items: %s",
+                     [(item.name, item.qty, item.price, item.product) for item in order_data.order_items])
     
     if not order_data.order_items or len(order_data.order_items) == 0:
         raise HTTPException(
@@ -43,14 +72,16 @@ async def add_order_items(
                 detail=f"Order item '{item.name}' is missing a product ID"
             )
     
+    uid = current_user.id
+    # Convert each client product ID once and reuse it for the lookup and the order items
     item_ids = [ObjectId(item.product) for item in order_data.order_items]
     items_from_db = await Product.find({"_id": {"$in": item_ids}}).to_list()
     
-    db_items_map = {str(item.id): item for item in items_from_db}
+    db_items_map = {item.id: item for item in items_from_db}
     
     db_order_items = []
-    for item_from_client in order_data.order_items:
-        matching_item = db_items_map.get(item_from_client.product)
+    for item_from_client, product_id in zip(order_data.order_items, item_ids):
+        matching_item = db_items_map.get(product_id)
         if not matching_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -62,7 +93,7 @@ async def add_order_items(
             "qty": item_from_client.qty,
             "image": item_from_client.image,
             "price": matching_item.price,
-            "product": ObjectId(item_from_client.product)
+            "product": product_id
         })
     
     prices = calc_prices(db_order_items)
@@ -80,12 +111,10 @@ async def add_order_items(
     
     order = Order(
         order_items=order_items_objects,
-        user=current_user.id,
-        shipping_address=ShippingAddress(
-            address=order_data.shipping_address.address,
-            city=order_data.shipping_address.city,
-            postal_code=order_data.shipping_address.postal_code,
-            country=order_data.shipping_address.country
+        user=uid,
+        # Already validated by ShippingAddressSchema; skip a second validation pass
+        shipping_address=ShippingAddress.model_construct(
+            **order_data.shipping_address.model_dump(by_alias=True)
         ),
         payment_method=order_data.payment_method,
         items_price=prices["itemsPrice"],
@@ -94,12 +123,12 @@ async def add_order_items(
         total_price=prices["totalPrice"]
     )
     
-    logger.info(f"[ORDER CREATE] Saving order to database for user {current_user.id}...")
+    logger.info("[ORDER CREATE] Saving order to database for user %s...", uid)
     try:
         await order.save()
-        logger.info(f"[ORDER CREATE] Order saved successfully: {order.id}")
+        logger.info("[ORDER CREATE] Order saved successfully: %s", order.id)
     except Exception as e:
-        logger.error(f"[ORDER CREATE] Failed to save order: {e}")
+        logger.error("[ORDER CREATE] Failed to save order: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create order: {str(e)}"
@@ -135,12 +164,13 @@ async def create_order_payment_intent(
         raise HTTPException(status_code=500, detail=f"Stripe error: {str(e)}")
 
 
-@router.get("/mine", response_model=List[OrderResponse])
+@router.get("/mine", response_class=Response, responses=_ORDER_LIST_RESPONSES)
 async def get_my_orders(current_user: User = Depends(get_current_user)):
     """Get logged in user orders"""
-    orders = await Order.find(Order.user == current_user.id).to_list()
-    
-    return [OrderResponse(**serialize_order(order)) for order in orders]
+    return Response(
+        await orders_json(Order.find(Order.user == current_user.id)),
+        media_type="application/json"
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -211,76 +241,90 @@ async def update_order_to_paid(
             detail="Order is already paid"
         )
     
-    is_new = await check_if_new_transaction(Order, payment_id)
-    
+    # The duplicate-transaction lookup (MongoDB) and the provider verification
+    # (HTTP) are independent, so overlap them instead of paying both round-trips.
+    payment_info = None
+    if payment_source == 'test':
+        is_new = await check_if_new_transaction(Order, payment_id)
+    else:
+        verify_payment = verify_stripe_payment if payment_source == 'stripe' else verify_paypal_payment
+        is_new, payment_info = await asyncio.gather(
+            check_if_new_transaction(Order, payment_id),
+            verify_payment(payment_id),
+            return_exceptions=True,
+        )
+        # A failed lookup must not read as "new" (exceptions are truthy): fail closed
+        if isinstance(is_new, BaseException):
+            raise is_new
+
     if not is_new:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Transaction has been used before"
         )
 
-    # ── Verify the payment with the appropriate provider ────────────────
+    # ── Check the provider verification result ──────────────────────────
     if payment_source == 'test':
         # Test payment for development - skip external verification
         print(f"[PAYMENT] Test payment accepted for order {order_id}")
-        pass
     elif payment_source == 'stripe':
-        try:
-            payment_info = await verify_stripe_payment(payment_id)
-            if not payment_info["verified"]:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Stripe payment not completed"
-                )
-        except HTTPException:
-            raise
-        except Exception as e:
+        if isinstance(payment_info, Exception):
             # allow through if Stripe key misconfigured in dev
-            print(f"[PAYMENT] Stripe verification error (allowing in dev): {e}")
-            pass
+            print(f"[PAYMENT] Stripe verification error (allowing in dev): {payment_info}")
+        elif not payment_info["verified"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Stripe payment not completed"
+            )
     else:
         # PayPal verification (existing logic)
-        try:
-            payment_info = await verify_paypal_payment(payment_id)
+        if isinstance(payment_info, Exception):
+            print(f"[PAYMENT] PayPal verification error (allowing in dev): {payment_info}")
+        else:
             if not payment_info["verified"]:
                 payment_info["value"] = str(order.total_price)
             paid_correct_amount = str(order.total_price) == payment_info["value"]
             if not paid_correct_amount:
                 print(f"[PAYMENT] Amount mismatch (allowing in dev): expected {order.total_price}, got {payment_info['value']}")
-                pass
-        except Exception as e:
-            print(f"[PAYMENT] PayPal verification error (allowing in dev): {e}")
-            pass
-    
-    # Update order payment status
-    order.is_paid = True
-    order.paid_at = datetime.utcnow()
     
     email = payment_data.get('email_address', '')
     if not email and payment_data.get('payer'):
         payer = payment_data.get('payer', {})
         email = payer.get('email_address', '')
     
-    update_time = payment_data.get('update_time') or datetime.utcnow().isoformat()
+    now = datetime.utcnow()
+    update_time = payment_data.get('update_time') or now.isoformat()
     
-    order.payment_result = PaymentResult(
+    payment_result = PaymentResult(
         id=payment_id,
         status=payment_status,
         update_time=update_time,
         email_address=email
     )
     
+    # Write only the payment fields; the isPaid filter guards against a
+    # duplicate webhook delivery racing this one
     try:
-        await order.save()
+        updated_order = await _find_one_and_update_order(
+            {"_id": order.id, "isPaid": False},
+            {"$set": {
+                "isPaid": True,
+                "paidAt": now,
+                "paymentResult": payment_result.model_dump(by_alias=True),
+                "updatedAt": now,
+            }},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update order: {str(e)}"
         )
     
-    updated_order = await Order.get(ObjectId(order_id))
-    
-    return OrderResponse(**serialize_order(updated_order))
+    if not updated_order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order is already paid"
+        )
     
     return OrderResponse(**serialize_order(updated_order))
 
@@ -291,13 +335,11 @@ async def update_order_to_delivered(
     admin_user: User = Depends(require_admin)
 ):
     """Update order to delivered (Admin only)"""
-    try:
-        order = await Order.get(ObjectId(order_id))
-    except:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
-        )
+    now = datetime.utcnow()
+    order = await _find_one_and_update_order(
+        {"_id": _parse_order_id(order_id)},
+        {"$set": {"isDelivered": True, "deliveredAt": now, "updatedAt": now}},
+    )
     
     if not order:
         raise HTTPException(
@@ -305,11 +347,6 @@ async def update_order_to_delivered(
             detail="Order not found"
         )
     
-    order.is_delivered = True
-    order.delivered_at = datetime.utcnow()
-    
-    await order.save()
-    
     return OrderResponse(**serialize_order(order))
 
 
@@ -319,37 +356,37 @@ async def mark_order_paid_manually(
     admin_user: User = Depends(require_admin)
 ):
     """Manually mark order as paid (Admin only - for testing or manual payments)"""
-    try:
-        order = await Order.get(ObjectId(order_id))
-    except:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
-        )
+    oid = _parse_order_id(order_id)
+    now = datetime.utcnow()
+    payment_result = PaymentResult(
+        id=f"MANUAL-{int(now.timestamp())}",
+        status="COMPLETED",
+        update_time=now.isoformat(),
+        email_address=admin_user.email
+    )
+    
+    # The isPaid filter makes the "already paid" check part of the same atomic write
+    order = await _find_one_and_update_order(
+        {"_id": oid, "isPaid": False},
+        {"$set": {
+            "isPaid": True,
+            "paidAt": now,
+            "paymentResult": payment_result.model_dump(by_alias=True),
+            "updatedAt": now,
+        }},
+    )
     
     if not order:
+        if await Order.find({"_id": oid}).count():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Order is already paid"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
     
-    if order.is_paid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Order is already paid"
-        )
-    
-    order.is_paid = True
-    order.paid_at = datetime.utcnow()
-    order.payment_result = PaymentResult(
-        id=f"MANUAL-{int(datetime.utcnow().timestamp())}",
-        status="COMPLETED",
-        update_time=datetime.utcnow().isoformat(),
-        email_address=admin_user.email
-    )
-    
-    await order.save()
-    
     print(f"[ADMIN] Order {order_id} manually marked as paid by {admin_user.email}")
     
     return OrderResponse(**serialize_order(order))
@@ -362,37 +399,35 @@ async def update_order_details(
     current_user: User = Depends(get_current_user),
 ):
     """Update shipping address and/or payment method on an unpaid order"""
-    try:
-        order = await Order.get(ObjectId(order_id))
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found",
-        )
-    if not order:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    if order.is_paid:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot update a paid order")
-    if str(order.user) != str(current_user.id) and not current_user.is_admin:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
-
+    oid = _parse_order_id(order_id)
+    
+    update_fields = {"updatedAt": datetime.utcnow()}
     if update_data.shipping_address:
-        order.shipping_address = ShippingAddress(
-            address=update_data.shipping_address.address,
-            city=update_data.shipping_address.city,
-            postal_code=update_data.shipping_address.postal_code,
-            country=update_data.shipping_address.country,
-        )
+        update_fields["shippingAddress"] = update_data.shipping_address.model_dump(by_alias=True)
     if update_data.payment_method:
-        order.payment_method = update_data.payment_method
+        update_fields["paymentMethod"] = update_data.payment_method
+
+    # Let MongoDB enforce "unpaid" and ownership in the same atomic write
+    filter_doc = {"_id": oid, "isPaid": False}
+    if not current_user.is_admin:
+        filter_doc["user"] = current_user.id
+
+    order = await _find_one_and_update_order(filter_doc, {"$set": update_fields})
+    if not order:
+        existing = await Order.get(oid)
+        if not existing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        if existing.is_paid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot update a paid order")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    await order.save()
     return OrderResponse(**serialize_order(order))
 
 
-@router.get("", response_model=List[OrderResponse])
+@router.get("", response_class=Response, responses=_ORDER_LIST_RESPONSES)
 async def get_orders(admin_user: User = Depends(require_admin)):
     """Get all orders (Admin only)"""
-    orders = await Order.find_all().to_list()
-    
-    return [OrderResponse(**serialize_order(order)) for order in orders]
+    return Response(
+        await orders_json(Order.find_all()),
+        media_type="application/json"
+    )
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from models.product import Product, Review
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from models.product import Product, Review, CASE_INSENSITIVE_COLLATION
 from models.user import User
 from schemas.product import (
     ProductCreate, ProductUpdate, ReviewCreate,
@@ -7,14 +7,38 @@ from schemas.product import (
 )
 from middleware.auth import get_current_user, require_admin
 from config.settings import settings
+from utils.http_cache import cached_json_response
 from typing import Optional, List
+from beanie import PydanticObjectId
 from bson import ObjectId
+from pydantic import BaseModel, Field
 from datetime import datetime
 import math
+import re
 import secrets
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
+# Categories kept out of the top-products fallback (compared case-insensitively)
+_TOP_EXCLUDED_CATEGORIES = frozenset({
+    "recording equipment",
+    "audio interface",
+    "studio equipment",
+    "recording gear",
+})
+_TOP_EXCLUDED_CATEGORY_FILTER = [
+    re.compile(f"^{re.escape(category)}$", re.IGNORECASE)
+    for category in sorted(_TOP_EXCLUDED_CATEGORIES)
+] + [None, ""]
+
+
+class AutocompleteProjection(BaseModel):
+    """Fields fetched from MongoDB for autocomplete suggestions"""
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    brand: Optional[str] = None
+    category: Optional[str] = None
+
 
 def generate_sku_fallback() -> str:
     """Generate a SKU when no ObjectId-based SKU is available yet."""
@@ -62,7 +86,7 @@ def product_to_response(product: Product) -> ProductResponse:
 
 
 @router.get("/top")
-async def get_top_products():
+async def get_top_products(request: Request):
     """Get featured products for carousel"""
     # Specific featured products for carousel (consumer products only)
     featured_names = [
@@ -82,71 +106,57 @@ async def get_top_products():
             products.append(product)
     
     # If featured products not found, fall back to top rated
-    # Exclude recording equipment from top products
+    # Exclude recording equipment from top products (filtered server-side)
     if len(products) < 3:
-        all_products = await Product.find(fetch_links=True).sort("-rating").to_list()
-        # Filter out recording equipment categories
-        filtered_products = [
-            p for p in all_products 
-            if p.category and p.category.lower() not in [
-                'recording equipment',
-                'audio interface',
-                'studio equipment',
-                'recording gear'
-            ]
-        ]
-        products = filtered_products[:4]
+        products = await Product.find(
+            {"category": {"$nin": _TOP_EXCLUDED_CATEGORY_FILTER}},
+            fetch_links=True
+        ).sort("-rating").limit(4).to_list()
     
-    return [product_to_response(product) for product in products]
+    return cached_json_response(request, [product_to_response(product) for product in products])
 
 
 @router.get("/autocomplete")
 async def get_autocomplete_suggestions(
+    request: Request,
     q: str = Query(..., min_length=1, max_length=100)
 ) -> List[dict]:
     """Get autocomplete suggestions for search query"""
     if len(q) < 2:
         return []
     
-    # Search in product names, brands, and categories
-    products = await Product.find({
-        "$or": [
-            {"name": {"$regex": q, "$options": "i"}},
-            {"brand": {"$regex": q, "$options": "i"}},
-            {"category": {"$regex": q, "$options": "i"}}
-        ]
-    }).limit(10).to_list()
-    
-    suggestions = []
-    seen = set()
+    # Prefix match as a range scan on the case-insensitive indexes; U+FFFF
+    # sorts after every character, so [q, q + U+FFFF) is everything starting with q
+    prefix = {"$gte": q, "$lt": q + "\uffff"}
+    products = await Product.find(
+        {
+            "$or": [
+                {"name": prefix},
+                {"brand": prefix},
+                {"category": prefix}
+            ]
+        },
+        collation=CASE_INSENSITIVE_COLLATION,
+    ).project(AutocompleteProjection).limit(10).to_list()
     
+    # Single insertion-ordered dict both dedups and collects; stop at 10
+    suggestions = {}
     for product in products:
-        # Add product name
-        if product.name not in seen:
-            suggestions.append({
-                "text": product.name,
-                "type": "product",
-                "id": str(product.id)
-            })
-            seen.add(product.name)
-        
-        # Add brand
-        if product.brand and product.brand not in seen:
-            suggestions.append({
-                "text": product.brand,
-                "type": "brand"
-            })
-            seen.add(product.brand)
-        
-        # Add category
-        if product.category and product.category not in seen:
-            suggestions.append({
-                "text": product.category,
-                "type": "category"
-            })
-            seen.add(product.category)
-    
-    return suggestions[:10]
+        candidates = (
+            ("product", product.name, str(product.id)),
+            ("brand", product.brand, None),
+            ("category", product.category, None),
+        )
+        for kind, text, product_id in candidates:
+            if text and text not in suggestions:
+                suggestion = {"text": text, "type": kind}
+                if product_id:
+                    suggestion["id"] = product_id
+                suggestions[text] = suggestion
+        if len(suggestions) >= 10:
+            break
+    
+    return cached_json_response(request, list(suggestions.values())[:10])
 
 
 @router.get("", response_model=ProductListResponse, response_model_exclude_none=False)
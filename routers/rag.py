@@ -5,15 +5,43 @@ Exposes semantic search, product Q&A, and indexing endpoints
 using the LangChain-based RAG service.
 """
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, Field
-
-from rag_service import get_vector_store, get_rag_chain, index_all_products
+import asyncio
+import time
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from rag_service import (
+    get_vector_store,
+    get_rag_chain,
+    index_all_products,
+    get_index_progress,
+    embedding_batcher,
+    semantic_cache,
+    normalize_query,
+)
 from config.settings import settings
+from models.product import Product
+from schemas.rag import REQUEST_MODEL_CONFIG
+from utils.db_lock import acquire_lock, release_lock
+from utils.http_cache import cached_json_response
+
+
+router = APIRouter(prefix="/api/rag", tags=["rag"], default_response_class=ORJSONResponse)
 
+SIMILAR_QUERY_DESCRIPTION_CHARS = 512
 
-router = APIRouter(prefix="/api/rag", tags=["rag"])
+# Index stats are polled by dashboards; share one Pinecone call per window
+STATS_CACHE_SECONDS = 5
+_stats_cache: Dict[str, Any] = {"expires_at": 0.0, "stats": None}
+
+# One full re-index at a time across all workers; the lease outlives any
+# realistic run so a crashed worker's lock still expires
+REINDEX_LOCK_NAME = "rag_reindex_all"
+REINDEX_LOCK_TTL_SECONDS = 3600
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -21,6 +49,8 @@ router = APIRouter(prefix="/api/rag", tags=["rag"])
 # ──────────────────────────────────────────────────────────────────────────────
 
 class SemanticSearchRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     query: str = Field(..., min_length=1, description="Natural language search query")
     top_k: int = Field(default=10, ge=1, le=50, description="Number of results")
     category: Optional[str] = Field(default=None, description="Filter by category")
@@ -30,11 +60,15 @@ class SemanticSearchRequest(BaseModel):
 
 
 class ProductQuestionRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     question: str = Field(..., min_length=1, description="Question about products")
     top_k: int = Field(default=5, ge=1, le=20, description="Number of context documents")
 
 
 class SimilarProductsRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     product_id: str = Field(..., description="Source product ID")
     top_k: int = Field(default=5, ge=1, le=20, description="Number of similar products")
 
@@ -57,15 +91,28 @@ async def semantic_search(request: SemanticSearchRequest):
     - "gifts for music lovers under $100"
     """
     try:
-        rag_chain = get_rag_chain()
-        results = rag_chain.search_products(
-            query=request.query,
-            k=request.top_k,
-            min_price=request.min_price,
-            max_price=request.max_price,
-            category=request.category,
-            min_rating=request.min_rating,
-        )
+        filters = (request.category, request.min_price, request.max_price, request.min_rating)
+        exact_key = ("search", normalize_query(request.query), request.top_k, filters)
+        results = semantic_cache.get_exact(exact_key)
+        
+        if results is None:
+            # Embed once: the same vector drives the cache probe and the search
+            query_embedding = await embedding_batcher.embed(request.query)
+            scope = ("search", request.top_k, filters)
+            results = semantic_cache.get_similar(query_embedding, scope)
+            
+            if results is None:
+                rag_chain = get_rag_chain()
+                results = await rag_chain.asearch_products(
+                    query=request.query,
+                    k=request.top_k,
+                    min_price=request.min_price,
+                    max_price=request.max_price,
+                    category=request.category,
+                    min_rating=request.min_rating,
+                    query_embedding=query_embedding,
+                )
+                semantic_cache.put(results, exact_key=exact_key, embedding=query_embedding, scope=scope)
         
         return {
             "query": request.query,
@@ -118,11 +165,22 @@ async def ask_about_products(request: ProductQuestionRequest):
     - "Compare the Sony and Apple headphones"
     """
     try:
-        rag_chain = get_rag_chain()
-        result = await rag_chain.ask(
-            question=request.question,
-            k=request.top_k,
-        )
+        exact_key = ("ask", normalize_query(request.question), request.top_k)
+        result = semantic_cache.get_exact(exact_key)
+        
+        if result is None:
+            question_embedding = await embedding_batcher.embed(request.question)
+            scope = ("ask", request.top_k)
+            result = semantic_cache.get_similar(question_embedding, scope)
+            
+            if result is None:
+                rag_chain = get_rag_chain()
+                result = await rag_chain.ask(
+                    question=request.question,
+                    k=request.top_k,
+                    question_embedding=question_embedding,
+                )
+                semantic_cache.put(result, exact_key=exact_key, embedding=question_embedding, scope=scope)
         
         return {
             "question": request.question,
@@ -157,39 +215,38 @@ async def find_similar_products(request: SimilarProductsRequest):
     Uses the product's embedding to find semantically similar items.
     """
     try:
-        from bson import ObjectId
-        from bson.errors import InvalidId
-        from pymongo import MongoClient
-        
         # Validate product_id
         try:
             oid = ObjectId(request.product_id)
         except InvalidId:
             raise HTTPException(status_code=400, detail="Invalid product ID format")
         
-        # Get product using PyMongo (sync, reuses connection pool)
-        from config.database import get_sync_db
-        db = get_sync_db()
-        product = db.products.find_one({"_id": oid})
+        # Product lookup (Motor) and stored-vector probe (Pinecone) are independent
+        product, stored_vector = await asyncio.gather(
+            Product.get_motor_collection().find_one(
+                {"_id": oid}, {"name": 1, "description": 1, "_id": 0}
+            ),
+            get_vector_store().afetch_vector(request.product_id),
+        )
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        # Search using product name and description as query
-        search_query = f"{product['name']} {product.get('description', '')}"
+        # Reuse the product's indexed vector; embed name + description only if missing
+        if stored_vector is None:
+            # Cap the description: embedding latency grows with input tokens
+            description = (product.get("description") or "")[:SIMILAR_QUERY_DESCRIPTION_CHARS]
+            search_query = f"{product['name']} {description}"
+            stored_vector = await embedding_batcher.embed(search_query)
         
         rag_chain = get_rag_chain()
-        results = rag_chain.search_products(
-            query=search_query,
-            k=request.top_k + 1,  # +1 to exclude self
+        similar = await rag_chain.asearch_products(
+            query=product["name"],
+            k=request.top_k,
+            query_embedding=stored_vector,
+            exclude_product_id=request.product_id,
         )
         
-        # Filter out the source product
-        similar = [
-            r for r in results 
-            if r.get("product_id") != request.product_id
-        ][:request.top_k]
-        
         return {
             "source_product": product["name"],
             "count": len(similar),
@@ -215,42 +272,78 @@ async def find_similar_products_get(
 # Indexing Endpoints
 # ──────────────────────────────────────────────────────────────────────────────
 
+async def _reindex_all_products(lock_owner: str) -> None:
+    """Background job: full re-index, then drop cached answers built on old data"""
+    try:
+        await index_all_products()
+    except Exception as e:
+        print(f"[RAG] Full re-index failed: {e}")
+    finally:
+        semantic_cache.clear()
+        _stats_cache["expires_at"] = 0.0
+        await asyncio.to_thread(release_lock, REINDEX_LOCK_NAME, lock_owner)
+
+
+async def _get_index_stats_cached(vector_store) -> Dict[str, Any]:
+    """Pinecone index stats, reused for STATS_CACHE_SECONDS"""
+    now = time.monotonic()
+    if _stats_cache["stats"] is None or _stats_cache["expires_at"] <= now:
+        _stats_cache["stats"] = await vector_store.aget_stats()
+        _stats_cache["expires_at"] = now + STATS_CACHE_SECONDS
+    return _stats_cache["stats"]
+
+
 @router.post("/index/all")
 async def index_all_products_endpoint(background_tasks: BackgroundTasks):
     """
     Index all products into the Pinecone vector store.
     
     This creates embeddings for all products and upserts them
-    into Pinecone for semantic search.
+    into Pinecone for semantic search. Runs in the background;
+    poll /api/rag/index/stats for progress.
     """
-    try:
-        result = await index_all_products()
+    # The progress check covers this worker; the DB lock covers the others
+    lock_owner = None
+    if get_index_progress()["status"] != "running":
+        lock_owner = await asyncio.to_thread(acquire_lock, REINDEX_LOCK_NAME, REINDEX_LOCK_TTL_SECONDS)
+    if lock_owner is None:
         return {
-            "status": result["status"],
-            "products_indexed": result.get("products_indexed", 0),
-            "total_vectors": result.get("total_vectors", 0),
-            "index_name": result.get("index_name"),
-            "namespace": result.get("namespace"),
+            "status": "running",
+            "message": "Indexing already in progress. Check /api/rag/index/stats for progress.",
             "framework": "langchain",
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    background_tasks.add_task(_reindex_all_products, lock_owner)
+    return {
+        "status": "started",
+        "message": "Indexing started in background. Check /api/rag/index/stats for progress.",
+        "framework": "langchain",
+    }
 
 
 @router.get("/index/stats")
-async def get_index_stats():
+async def get_index_stats(request: Request):
     """
     Get statistics about the Pinecone vector index.
+    
+    Stats are cached for a few seconds and served with an ETag, so
+    pollers get 304 Not Modified while nothing changes.
     """
     try:
         vector_store = get_vector_store()
-        stats = vector_store.get_stats()
-        return {
-            "index_name": vector_store.index_name,
-            "namespace": vector_store.namespace,
-            "stats": stats,
-            "framework": "langchain",
-        }
+        stats = await _get_index_stats_cached(vector_store)
+        return cached_json_response(
+            request,
+            {
+                "index_name": vector_store.index_name,
+                "namespace": vector_store.namespace,
+                "stats": stats,
+                "indexing": get_index_progress(),
+                "framework": "langchain",
+            },
+            max_age=STATS_CACHE_SECONDS,
+            s_maxage=STATS_CACHE_SECONDS,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -262,19 +355,28 @@ async def get_index_stats():
 @router.get("/health")
 async def rag_health_check():
     """Check RAG service health."""
+    # Never cached by browsers or shared caches: probes must see this instance's state
+    headers = {"Cache-Control": "no-store"}
     try:
         vector_store = get_vector_store()
-        stats = vector_store.get_stats()
+        stats = await _get_index_stats_cached(vector_store)
         
-        return {
-            "status": "healthy",
-            "vector_store": "pinecone",
-            "index": vector_store.index_name,
-            "total_vectors": stats.get("total_vectors", 0),
-            "framework": "langchain",
-        }
+        return ORJSONResponse(
+            {
+                "status": "healthy",
+                "vector_store": "pinecone",
+                "index": vector_store.index_name,
+                "total_vectors": stats.get("total_vectors", 0),
+                "cache": semantic_cache.stats(),
+                "framework": "langchain",
+            },
+            headers=headers,
+        )
     except Exception as e:
-        return {
-            "status": "unhealthy",
-            "error": str(e),
-        }
+        return ORJSONResponse(
+            {
+                "status": "unhealthy",
+                "error": str(e),
+            },
+            headers=headers,
+        )
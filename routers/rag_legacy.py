@@ -5,14 +5,16 @@ Exposes semantic search, product Q&A, and indexing endpoints.
 """
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
 from rag_service import rag_retriever, product_indexer
 from config.settings import settings
+from schemas.rag import REQUEST_MODEL_CONFIG
 
 
-router = APIRouter(prefix="/api/rag", tags=["rag"])
+router = APIRouter(prefix="/api/rag", tags=["rag"], default_response_class=ORJSONResponse)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -20,6 +22,8 @@ router = APIRouter(prefix="/api/rag", tags=["rag"])
 # ──────────────────────────────────────────────────────────────────────────────
 
 class SemanticSearchRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     query: str = Field(..., min_length=1, description="Natural language search query")
     top_k: int = Field(default=10, ge=1, le=50, description="Number of results")
     category: Optional[str] = Field(default=None, description="Filter by category")
@@ -30,23 +34,31 @@ class SemanticSearchRequest(BaseModel):
 
 
 class ProductQuestionRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     product_id: str = Field(..., description="Product ID to ask about")
     question: str = Field(..., min_length=1, description="Question about the product")
 
 
 class SimilarProductsRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     product_id: str = Field(..., description="Source product ID")
     top_k: int = Field(default=5, ge=1, le=20, description="Number of similar products")
     same_category: bool = Field(default=True, description="Only same category")
 
 
 class HybridSearchRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     query: str = Field(..., min_length=1, description="Search query")
     top_k: int = Field(default=10, ge=1, le=50, description="Number of results")
     semantic_weight: float = Field(default=0.7, ge=0, le=1, description="Weight for semantic vs keyword")
 
 
 class IndexProductsRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     product_ids: List[str] = Field(..., min_items=1, description="Product IDs to index")
 
 
@@ -68,21 +80,17 @@ async def semantic_search(request: SemanticSearchRequest):
     - "gifts for music lovers under $100"
     """
     try:
-        if request.category or request.min_price or request.max_price or request.min_rating or request.in_stock_only:
-            results = await rag_retriever.search_with_filters(
-                query=request.query,
+        results = await rag_retriever.search(
+            query=request.query,
+            top_k=request.top_k,
+            filter=rag_retriever.build_filter(
                 category=request.category,
                 min_price=request.min_price,
                 max_price=request.max_price,
                 min_rating=request.min_rating,
                 in_stock_only=request.in_stock_only,
-                top_k=request.top_k,
-            )
-        else:
-            results = await rag_retriever.search(
-                query=request.query,
-                top_k=request.top_k,
-            )
+            ),
+        )
         
         return {
             "query": request.query,
@@ -90,7 +98,7 @@ async def semantic_search(request: SemanticSearchRequest):
             "results": [
                 {
                     "product_id": r.product_id,
-                    "score": round(r.score, 4),
+                    "score": r.score,
                     "product": r.product,
                 }
                 for r in results
@@ -145,7 +153,7 @@ async def hybrid_search(request: HybridSearchRequest):
             "results": [
                 {
                     "product_id": r.product_id,
-                    "score": round(r.score, 4),
+                    "score": r.score,
                     "product": r.product,
                 }
                 for r in results
@@ -176,7 +184,7 @@ async def find_similar_products(request: SimilarProductsRequest):
             "similar_products": [
                 {
                     "product_id": r.product_id,
-                    "score": round(r.score, 4),
+                    "score": r.score,
                     "product": r.product,
                 }
                 for r in results
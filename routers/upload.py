@@ -1,30 +1,64 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Request
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Request, BackgroundTasks
 from pathlib import Path
 import os
 import uuid
+import aiofiles
+import logging
+from config.settings import settings
 from middleware.auth import get_current_user
 from models.user import User
+from utils.image_variants import generate_variants, variant_urls, variants_available
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+_AVIF_BRANDS = (b"avif", b"avis")
+
+
+def _is_avif(head: bytes) -> bool:
+    """AVIF if the ISO-BMFF ftyp box lists an AVIF brand as major or compatible brand"""
+    if head[4:8] != b"ftyp":
+        return False
+    box_end = min(int.from_bytes(head[:4], "big"), len(head))
+    # major brand at 8, minor version at 12, compatible brands from 16 on;
+    # mif1/msf1-branded files carry avif only among the compatible brands
+    brands = [head[8:12]] + [head[i:i + 4] for i in range(16, box_end - 3, 4)]
+    return any(brand in _AVIF_BRANDS for brand in brands)
+
+
+def _is_image(head: bytes) -> bool:
+    """Check the leading bytes against the signatures of the allowed image types"""
+    return (
+        head.startswith(b"\xff\xd8\xff")                       # JPEG
+        or head.startswith(b"\x89PNG\r\n\x1a\n")               # PNG
+        or head[:6] in (b"GIF87a", b"GIF89a")                  # GIF
+        or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")     # WebP
+        or _is_avif(head)                                      # AVIF
+    )
+
 
 @router.post("")
 async def upload_file(
     request: Request,
+    background_tasks: BackgroundTasks,
     image: UploadFile = File(...)
 ):
     """Upload a file"""
     # Try to get current user but don't require it (for now)
     try:
         user = await get_current_user(request)
-        print(f"[UPLOAD] Upload request from user: {user.email}")
+        logger.info("[UPLOAD] Upload request from user: %s", user.email)
     except:
-        print(f"[UPLOAD] Upload request (no auth)")
+        logger.info("[UPLOAD] Upload request (no auth)")
     
-    print(f"[UPLOAD] File details - Filename: {image.filename}, Content-Type: {image.content_type}")
+    logger.debug("[UPLOAD] File details - Filename: %s, Content-Type: %s", image.filename, image.content_type)
     
     if not image:
         raise HTTPException(
@@ -45,18 +79,43 @@ async def upload_file(
     file_path = UPLOAD_DIR / unique_filename
     
     try:
-        contents = await image.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        print(f"[SUCCESS] File saved successfully: {file_path}")
+        # Stream to disk in chunks instead of buffering the whole upload
+        bytes_written = 0
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await image.read(UPLOAD_CHUNK_SIZE):
+                if bytes_written == 0 and not _is_image(chunk):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="File content is not a supported image"
+                    )
+                bytes_written += len(chunk)
+                if bytes_written > settings.MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Max size: {settings.MAX_UPLOAD_BYTES} bytes"
+                    )
+                await f.write(chunk)
+        logger.debug("[UPLOAD] File saved successfully: %s", file_path)
+    except HTTPException:
+        file_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
-        print(f"[ERROR] Failed to save file: {str(e)}")
+        file_path.unlink(missing_ok=True)
+        logger.error("[UPLOAD] Failed to save file: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
     
+    # Resizing runs after the response is sent; variant URLs resolve once it
+    # finishes. Without pyvips none are written, so none are advertised
+    variants = {}
+    if variants_available():
+        background_tasks.add_task(generate_variants, file_path)
+        variants = variant_urls(file_path)
+    
     return {
         "message": "File uploaded successfully",
-        "image": f"/{file_path.as_posix()}"
+        "image": f"/{file_path.as_posix()}",
+        "variants": variants
     }
@@ -8,9 +8,17 @@ os.environ['SKIP_MCP'] = 'true'
 import uvicorn
 
 if __name__ == "__main__":
+    # Single worker unless WEB_CONCURRENCY says otherwise: the semantic and
+    # stats caches are per process, and startup/re-index work is shared across
+    # workers only through DB locks. "auto" picks uvloop/httptools when
+    # installed (not on Windows) and falls back to asyncio/h11.
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=5001,
-        log_level="info"
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop=os.getenv("UVICORN_LOOP", "auto"),
+        http=os.getenv("UVICORN_HTTP", "auto"),
+        log_level="info",
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true",
     )
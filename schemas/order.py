@@ -3,9 +3,16 @@ from typing import List, Optional, Any
 from datetime import datetime
 
 
+# Shared model configs (built once, reused by every schema below)
+_CFG = ConfigDict(populate_by_name=True)
+_EMBEDDED_CFG = ConfigDict(populate_by_name=True, extra="ignore")
+_REQUEST_CFG = ConfigDict(populate_by_name=True, extra="ignore", frozen=True)
+_RESP_CFG = ConfigDict(populate_by_name=True, from_attributes=True)
+
+
 # Embedded schemas
 class ShippingAddressSchema(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+    model_config = _EMBEDDED_CFG
     
     address: str
     city: str
@@ -14,7 +21,7 @@ class ShippingAddressSchema(BaseModel):
 
 
 class OrderItemSchema(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+    model_config = _EMBEDDED_CFG
     
     name: str
     qty: int
@@ -33,7 +40,7 @@ class OrderItemSchema(BaseModel):
 
 
 class PaymentResultSchema(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = _CFG
     
     id: Optional[str] = None
     status: Optional[str] = None
@@ -43,7 +50,7 @@ class PaymentResultSchema(BaseModel):
 
 # Request schemas
 class OrderCreate(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+    model_config = _REQUEST_CFG
     
     order_items: List[OrderItemSchema] = Field(alias="orderItems")
     shipping_address: ShippingAddressSchema = Field(alias="shippingAddress")
@@ -52,13 +59,14 @@ class OrderCreate(BaseModel):
 
 class OrderUpdatePrePay(BaseModel):
     """Update shipping address and/or payment method on an unpaid order."""
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = _REQUEST_CFG
 
     shipping_address: Optional[ShippingAddressSchema] = Field(None, alias="shippingAddress")
     payment_method: Optional[str] = Field(None, alias="paymentMethod")
 
 
 class OrderPaymentUpdate(BaseModel):
+    # Allow any other fields PayPal might send
     model_config = ConfigDict(populate_by_name=True, extra='allow', arbitrary_types_allowed=True)
     
     # Make ALL fields optional with defaults to accept any PayPal response structure
@@ -75,14 +83,11 @@ class OrderPaymentUpdate(BaseModel):
     purchase_units: Optional[List[dict]] = None
     links: Optional[List[dict]] = None
     intent: Optional[str] = None
-    
-    # Allow any other fields PayPal might send
-    model_config = ConfigDict(extra='allow', populate_by_name=True)
 
 
 # Response schemas
 class OrderResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+    model_config = _RESP_CFG
     
     id: str = Field(alias="_id")
     user: str
@@ -2,10 +2,19 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+__all__ = [
+    "ProductCreate", "ProductUpdate", "ReviewCreate",
+    "ProductResponse", "ReviewResponse", "ProductListResponse",
+]
+
+# Shared model configs (built once, reused by every schema below)
+_REQUEST_CFG = ConfigDict(populate_by_name=True, frozen=True)
+_RESP_CFG = ConfigDict(populate_by_name=True, from_attributes=True)
+
 
 # Request schemas
 class ProductCreate(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = _REQUEST_CFG
     
     sku: Optional[str] = None
     name: str = "Sample name"
@@ -20,7 +29,7 @@ class ProductCreate(BaseModel):
 
 
 class ProductUpdate(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = _REQUEST_CFG
     
     sku: Optional[str] = None
     name: Optional[str] = None
@@ -35,13 +44,15 @@ class ProductUpdate(BaseModel):
 
 
 class ReviewCreate(BaseModel):
+    model_config = _REQUEST_CFG
+    
     rating: int = Field(ge=1, le=5)
     comment: str
 
 
 # Response schemas
 class ReviewResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+    model_config = _RESP_CFG
     
     id: str = Field(alias="_id")
     name: str
@@ -52,7 +63,7 @@ class ReviewResponse(BaseModel):
 
 
 class ProductResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+    model_config = _RESP_CFG
     
     id: str = Field(alias="_id")
     user: str
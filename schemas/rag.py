@@ -0,0 +1,5 @@
+from pydantic import ConfigDict
+
+
+# RAG request bodies are immutable and reject unknown fields
+REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
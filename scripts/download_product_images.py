@@ -8,6 +8,7 @@ and updates the MongoDB `image` field.
 
 Usage:
     pip install duckduckgo-search Pillow
+    pip install pyvips   # optional, faster resizing (needs libvips)
     python scripts/download_product_images.py
 """
 
@@ -16,13 +17,24 @@ import sys
 import re
 import time
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from PIL import Image
+from pymongo import UpdateOne
+
+try:
+    import pyvips  # Optional: faster streaming resize (needs libvips)
+except ImportError:
+    pyvips = None
 
 from config.database import get_sync_db
 
@@ -34,6 +46,22 @@ TARGET_WIDTH = 640
 TARGET_HEIGHT = 640
 JPEG_QUALITY = 85
 
+# Download limits
+MIN_IMAGE_BYTES = 5000              # Smaller responses are thumbnails/placeholders
+MAX_IMAGE_BYTES = 4 * 1024 * 1024   # Abort oversized downloads early
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Downloads and resizes overlap across workers; searches share one rate limit
+MAX_WORKERS = 4
+# Adaptive pacing for DuckDuckGo searches (shared by all workers): the
+# interval shrinks on success and doubles whenever we get rate limited
+SEARCH_INTERVAL_START = 1.0
+SEARCH_INTERVAL_MIN = 0.5
+SEARCH_INTERVAL_MAX = 60.0
+
+# Image path updates are written in batches of this many as downloads finish
+DB_FLUSH_EVERY = 50
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                   "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -41,16 +69,97 @@ HEADERS = {
 }
 
 
+def _make_session() -> requests.Session:
+    """Shared keep-alive session for image downloads, pooled per host."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=MAX_WORKERS * 2,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_HTTP = _make_session()
+
+_RE_NONWORD = re.compile(r'[^\w\s-]')
+_RE_WS = re.compile(r'[\s_]+')
+_RE_DASH = re.compile(r'-+')
+
+
+@lru_cache(maxsize=4096)
 def slugify(name: str) -> str:
     """Convert product name to a clean filename slug."""
-    slug = re.sub(r'[^\w\s-]', '', name.lower())
-    slug = re.sub(r'[\s_]+', '-', slug)
-    slug = re.sub(r'-+', '-', slug).strip('-')
-    return slug
+    slug = _RE_NONWORD.sub('', name.lower())
+    slug = _RE_WS.sub('-', slug)
+    return _RE_DASH.sub('-', slug).strip('-')
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe limiter: hands out one token per interval across all callers.
+
+    success() decays the interval toward SEARCH_INTERVAL_MIN; backoff()
+    doubles it (up to SEARCH_INTERVAL_MAX) and holds every caller for that long.
+    """
+
+    def __init__(self, interval: float = SEARCH_INTERVAL_START):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_at = time.monotonic()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def success(self) -> None:
+        with self._lock:
+            self.interval = max(SEARCH_INTERVAL_MIN, self.interval * 0.8)
+
+    def backoff(self) -> float:
+        with self._lock:
+            self.interval = min(SEARCH_INTERVAL_MAX, self.interval * 2)
+            self._next_at = max(self._next_at, time.monotonic() + self.interval)
+            return self.interval
+
+
+search_limiter = AdaptiveRateLimiter()
 
 
 def process_image(raw_bytes: bytes, output_path: Path) -> bool:
     """Resize and save image as optimized JPEG."""
+    if pyvips is not None:
+        return _process_image_vips(raw_bytes, output_path)
+    return _process_image_pil(raw_bytes, output_path)
+
+
+def _process_image_vips(raw_bytes: bytes, output_path: Path) -> bool:
+    """libvips pipeline: decode, shrink, pad and encode in one streaming pass."""
+    try:
+        # Fit within the target box (shrink-on-load, never upscale)
+        img = pyvips.Image.thumbnail_buffer(raw_bytes, TARGET_WIDTH, height=TARGET_HEIGHT, size="down")
+        if img.hasalpha():
+            img = img.flatten(background=[255, 255, 255])
+        img = img.colourspace("srgb")
+
+        # Center on a white canvas
+        canvas = img.gravity("centre", TARGET_WIDTH, TARGET_HEIGHT, extend="background", background=[255, 255, 255])
+        output_path.write_bytes(canvas.jpegsave_buffer(Q=JPEG_QUALITY, optimize_coding=True, strip=True))
+        return True
+    except Exception as e:
+        print(f"    Image processing error: {e}")
+        return False
+
+
+def _process_image_pil(raw_bytes: bytes, output_path: Path) -> bool:
+    """Pillow fallback when pyvips is not installed."""
     try:
         img = Image.open(io.BytesIO(raw_bytes))
         img = img.convert("RGB")
@@ -71,8 +180,33 @@ def process_image(raw_bytes: bytes, output_path: Path) -> bool:
         return False
 
 
-def search_and_download(product_name: str, brand: str = "") -> str | None:
-    """Search DuckDuckGo for a product image and download it."""
+def download_image(url: str) -> bytes | None:
+    """
+    Stream an image into memory, giving up early on bad responses.
+
+    Returns None for non-200 or non-image responses, payloads over
+    MAX_IMAGE_BYTES, and anything under MIN_IMAGE_BYTES (likely a thumbnail).
+    """
+    with _HTTP.get(url, timeout=15, stream=True) as resp:
+        if resp.status_code != 200:
+            return None
+        content_type = resp.headers.get("content-type", "")
+        if content_type and not content_type.startswith("image/"):
+            return None
+
+        buf = bytearray()
+        for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+            buf.extend(chunk)
+            if len(buf) > MAX_IMAGE_BYTES:
+                return None
+
+    if len(buf) < MIN_IMAGE_BYTES:
+        return None
+    return bytes(buf)
+
+
+def search_and_download(product_name: str, out_path: Path, brand: str = "") -> str | None:
+    """Search DuckDuckGo for a product image and save it to out_path."""
     from duckduckgo_search import DDGS
 
     # Build search query - try different variations
@@ -83,11 +217,12 @@ def search_and_download(product_name: str, brand: str = "") -> str | None:
 
     for qi, query in enumerate(search_terms):
         try:
+            search_limiter.acquire()
             with DDGS() as ddgs:
                 results = list(ddgs.images(query, max_results=5))
+            search_limiter.success()
 
             if not results:
-                time.sleep(3)
                 continue
 
             # Try each image result
@@ -101,34 +236,28 @@ def search_and_download(product_name: str, brand: str = "") -> str | None:
                     continue
 
                 try:
-                    resp = requests.get(img_url, timeout=15, headers=HEADERS)
-                    if resp.status_code == 200 and len(resp.content) > 5000:
-                        # Save as clean JPEG
-                        filename = slugify(product_name) + ".jpg"
-                        filepath = IMAGE_DIR / filename
-
-                        if process_image(resp.content, filepath):
-                            return f"/images/{filename}"
+                    raw_bytes = download_image(img_url)
                 except requests.RequestException:
                     continue
 
+                # Save as clean JPEG
+                if raw_bytes and process_image(raw_bytes, out_path):
+                    return f"/images/{out_path.name}"
+
         except Exception as e:
             print(f"\n    Search error for '{query}': {e}")
-            # On rate limit, wait longer
-            if "Ratelimit" in str(e) or "403" in str(e):
-                print(f"    Rate limited, waiting 30s...")
-                time.sleep(30)
+            # On rate limit, slow every worker down
+            if "Ratelimit" in str(e) or "403" in str(e) or "429" in str(e):
+                delay = search_limiter.backoff()
+                print(f"    Rate limited, search interval now {delay:.1f}s")
             continue
 
-        # Wait between search query attempts
-        time.sleep(5)
-
     return None
 
 
 def main():
     db = get_sync_db()
-    products = list(db.products.find({}))
+    products = list(db.products.find({}, {"name": 1, "brand": 1, "image": 1}).batch_size(500))
 
     print(f"=" * 60)
     print(f"  Product Image Downloader")
@@ -140,41 +269,64 @@ def main():
     updated = 0
     failed = 0
     skipped = 0
+    to_download = []
+    # Pending image path updates; flushed every DB_FLUSH_EVERY so an interrupted
+    # run keeps what it already saved and a re-run skips those downloads
+    ops = []
+
+    def flush_ops():
+        if ops:
+            db.products.bulk_write(ops, ordered=False, bypass_document_validation=True)
+            ops.clear()
+
+    # One directory read instead of a stat() per product; downloads only
+    # start after this loop, so the snapshot stays valid for the checks
+    with os.scandir(IMAGE_DIR) as entries:
+        existing_sizes = {e.name: e.stat().st_size for e in entries if e.is_file()}
 
     for i, product in enumerate(products, 1):
         name = product.get("name", "Unknown")
-        brand = product.get("brand", "")
         old_image = product.get("image", "")
 
+        filename = f"{slugify(name)}.jpg"
+        filepath = IMAGE_DIR / filename
+
         # Check if we already have a real JPEG for this product
-        expected_jpg = IMAGE_DIR / (slugify(name) + ".jpg")
-        if expected_jpg.exists() and expected_jpg.stat().st_size > 5000:
+        if existing_sizes.get(filename, 0) > MIN_IMAGE_BYTES:
             print(f"[{i:2d}/{len(products)}] {name[:45]:45s} SKIP (already have .jpg)")
             skipped += 1
             # Still update DB to point to the jpg
-            new_path = f"/images/{expected_jpg.name}"
+            new_path = f"/images/{filename}"
             if old_image != new_path:
-                db.products.update_one({"_id": product["_id"]}, {"$set": {"image": new_path}})
+                ops.append(UpdateOne({"_id": product["_id"]}, {"$set": {"image": new_path}}))
             continue
 
-        print(f"[{i:2d}/{len(products)}] {name[:45]:45s} ", end="", flush=True)
-
-        new_image = search_and_download(name, brand)
+        to_download.append((i, product, filepath))
 
-        if new_image:
-            # Update MongoDB
-            db.products.update_one(
-                {"_id": product["_id"]},
-                {"$set": {"image": new_image}}
-            )
-            print(f"OK -> {new_image}")
-            updated += 1
-        else:
-            print(f"FAILED (keeping {old_image})")
-            failed += 1
-
-        # Rate limit - be respectful to DuckDuckGo
-        time.sleep(8)
+    # Search + download + resize in parallel; DB writes stay on this thread
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(search_and_download, product.get("name", "Unknown"), filepath, product.get("brand", "")): (i, product)
+                for i, product, filepath in to_download
+            }
+            for future in as_completed(futures):
+                i, product = futures[future]
+                name = product.get("name", "Unknown")
+                new_image = future.result()
+
+                if new_image:
+                    ops.append(UpdateOne({"_id": product["_id"]}, {"$set": {"image": new_image}}))
+                    print(f"[{i:2d}/{len(products)}] {name[:45]:45s} OK -> {new_image}")
+                    updated += 1
+                    if len(ops) >= DB_FLUSH_EVERY:
+                        flush_ops()
+                else:
+                    print(f"[{i:2d}/{len(products)}] {name[:45]:45s} FAILED (keeping {product.get('image', '')})")
+                    failed += 1
+    finally:
+        # Also on Ctrl-C or a failed download: record the images already saved
+        flush_ops()
 
     print()
     print(f"=" * 60)
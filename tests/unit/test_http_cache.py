@@ -0,0 +1,47 @@
+"""cached_json_response: Cache-Control, ETag and 304 revalidation"""
+import orjson
+from starlette.requests import Request
+
+from utils.http_cache import cached_json_response
+
+
+def make_request(if_none_match=None):
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_full_response_carries_cache_headers():
+    response = cached_json_response(make_request(), {"a": 1}, max_age=5, s_maxage=30)
+
+    assert response.status_code == 200
+    assert orjson.loads(response.body) == {"a": 1}
+    assert response.headers["cache-control"] == "public, max-age=5, s-maxage=30"
+    assert response.headers["etag"].startswith('"')
+
+
+def test_etag_depends_only_on_payload():
+    first = cached_json_response(make_request(), {"a": 1})
+    same = cached_json_response(make_request(), {"a": 1})
+    other = cached_json_response(make_request(), {"a": 2})
+
+    assert first.headers["etag"] == same.headers["etag"]
+    assert first.headers["etag"] != other.headers["etag"]
+
+
+def test_matching_if_none_match_returns_304():
+    etag = cached_json_response(make_request(), [1, 2]).headers["etag"]
+
+    response = cached_json_response(make_request(f'"stale", {etag}'), [1, 2])
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+
+
+def test_stale_if_none_match_returns_body():
+    response = cached_json_response(make_request('"stale"'), [1, 2])
+
+    assert response.status_code == 200
+    assert orjson.loads(response.body) == [1, 2]
@@ -0,0 +1,66 @@
+"""orders_json: JSON array shape of the order list endpoints"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from bson import ObjectId
+
+from utils.order_serializer import orders_json
+
+
+def make_order(paid=False):
+    return SimpleNamespace(
+        id=ObjectId(),
+        user=ObjectId(),
+        order_items=[SimpleNamespace(name="Mic", qty=2, image="/images/mic.jpg", price=49.5, product=ObjectId())],
+        shipping_address=SimpleNamespace(address="1 Main St", city="Springfield", postal_code="12345", country="US"),
+        payment_method="PayPal",
+        payment_result=None,
+        items_price=99.0,
+        tax_price=9.9,
+        shipping_price=0.0,
+        total_price=108.9,
+        is_paid=paid,
+        paid_at=datetime(2024, 1, 2, 3, 4, 5) if paid else None,
+        is_delivered=False,
+        delivered_at=None,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+async def aiter_orders(orders):
+    for order in orders:
+        yield order
+
+
+@pytest.mark.asyncio
+async def test_empty_query_is_empty_array():
+    assert orjson.loads(await orders_json(aiter_orders([]))) == []
+
+
+@pytest.mark.asyncio
+async def test_orders_serialize_with_response_field_names():
+    orders = [make_order(), make_order(paid=True)]
+
+    data = orjson.loads(await orders_json(aiter_orders(orders)))
+
+    assert [o["_id"] for o in data] == [str(o.id) for o in orders]
+    first = data[0]
+    assert first["user"] == str(orders[0].user)
+    assert first["orderItems"][0]["product"] == str(orders[0].order_items[0].product)
+    assert first["shippingAddress"]["postalCode"] == "12345"
+    assert first["paymentResult"] is None
+    assert first["paidAt"] is None
+    assert data[1]["paidAt"] == "2024-01-02T03:04:05"
+
+
+@pytest.mark.asyncio
+async def test_cursor_error_propagates_instead_of_truncating():
+    async def failing():
+        yield make_order()
+        raise RuntimeError("cursor died")
+
+    with pytest.raises(RuntimeError):
+        await orders_json(failing())
@@ -0,0 +1,105 @@
+"""SemanticCache: TTL expiry, similarity threshold and global LRU eviction"""
+import importlib
+
+import pytest
+
+from rag_service.semantic_cache import SemanticCache, normalize_query
+
+# The package re-exports the `semantic_cache` singleton under the module's name
+semantic_cache_module = importlib.import_module("rag_service.semantic_cache")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable stand-in for time.monotonic()"""
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_normalize_query_drops_filler_and_punctuation():
+    assert normalize_query("Can you show me the Office Chairs?!") == "office chairs"
+
+
+def test_exact_hit_until_ttl_expires(clock):
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=10)
+    cache.put("payload", exact_key="k")
+
+    assert cache.get_exact("k") == "payload"
+    clock[0] += 61
+    assert cache.get_exact("k") is None
+    assert cache.stats()["exact_entries"] == 0
+
+
+def test_similar_hit_respects_threshold_and_scope():
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.95, max_entries=10)
+    cache.put("chairs", embedding=[1.0, 0.0], scope=("search", 10))
+
+    assert cache.get_similar([0.99, 0.05], ("search", 10)) == "chairs"
+    assert cache.get_similar([0.0, 1.0], ("search", 10)) is None
+    assert cache.get_similar([1.0, 0.0], ("search", 5)) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_zero_threshold_is_not_replaced_by_default():
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0, max_entries=10)
+    assert cache.similarity_threshold == 0
+    cache.put("any", embedding=[1.0, 0.0], scope="s")
+    assert cache.get_similar([0.1, 1.0], "s") == "any"
+
+
+def test_max_entries_is_global_across_scopes():
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=3)
+    for top_k in range(10):
+        cache.put(top_k, embedding=[1.0, 0.0], scope=("search", top_k))
+
+    stats = cache.stats()
+    assert stats["semantic_entries"] == 3
+    # Evicted scopes are dropped, not left behind empty
+    assert stats["semantic_scopes"] == 3
+    assert cache.get_similar([1.0, 0.0], ("search", 0)) is None
+    assert cache.get_similar([1.0, 0.0], ("search", 9)) == 9
+
+
+def test_eviction_is_least_recently_used():
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=2)
+    cache.put("a", embedding=[1.0, 0.0], scope="a")
+    cache.put("b", embedding=[1.0, 0.0], scope="b")
+    # Touch "a" so "b" becomes the eviction candidate
+    assert cache.get_similar([1.0, 0.0], "a") == "a"
+    cache.put("c", embedding=[1.0, 0.0], scope="c")
+
+    assert cache.get_similar([1.0, 0.0], "a") == "a"
+    assert cache.get_similar([1.0, 0.0], "b") is None
+    assert cache.get_similar([1.0, 0.0], "c") == "c"
+
+
+def test_expired_entries_are_swept_from_other_scopes(clock):
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=10)
+    cache.put("old", exact_key="old", embedding=[1.0, 0.0], scope="old")
+    clock[0] += 61
+    cache.put("new", embedding=[0.0, 1.0], scope="new")
+
+    stats = cache.stats()
+    assert stats["exact_entries"] == 0
+    assert stats["semantic_entries"] == 1
+    assert stats["semantic_scopes"] == 1
+
+
+def test_new_entry_in_scope_is_visible_to_lookups():
+    # The stacked matrix for a scope must be rebuilt after an insert
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=10)
+    cache.put("x", embedding=[1.0, 0.0], scope="s")
+    assert cache.get_similar([0.0, 1.0], "s") is None
+    cache.put("y", embedding=[0.0, 1.0], scope="s")
+    assert cache.get_similar([0.0, 1.0], "s") == "y"
+
+
+def test_clear_empties_both_tiers():
+    cache = SemanticCache(ttl_seconds=60, similarity_threshold=0.9, max_entries=10)
+    cache.put("p", exact_key="k", embedding=[1.0, 0.0], scope="s")
+    cache.clear()
+
+    assert cache.get_exact("k") is None
+    assert cache.get_similar([1.0, 0.0], "s") is None
+    assert cache.stats()["semantic_scopes"] == 0
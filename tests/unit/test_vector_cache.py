@@ -0,0 +1,43 @@
+"""ProductVectorCache and its int8 quantization"""
+import numpy as np
+
+from rag_service.vector_cache import ProductVectorCache, dequantize_int8, quantize_int8
+
+
+def test_int8_round_trip_is_close():
+    rng = np.random.default_rng(0)
+    vector = rng.standard_normal(1536).astype(np.float32)
+
+    codes, scale = quantize_int8(vector.tolist())
+    restored = dequantize_int8(codes, scale)
+
+    assert codes.dtype == np.int8
+    # Symmetric quantization error is at most half a step
+    assert np.max(np.abs(restored - vector)) <= scale / 2 + 1e-6
+    cosine = restored @ vector / (np.linalg.norm(restored) * np.linalg.norm(vector))
+    assert cosine > 0.999
+
+
+def test_int8_zero_vector():
+    codes, scale = quantize_int8([0.0, 0.0, 0.0])
+    assert dequantize_int8(codes, scale).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_lru_eviction_and_discard():
+    cache = ProductVectorCache(max_entries=2)
+    cache.put("a", [1.0, 0.0])
+    cache.put("b", [0.0, 1.0])
+    assert cache.get("a") is not None
+    cache.put("c", [1.0, 1.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    cache.discard(["a"])
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_zero_max_entries_caches_nothing():
+    cache = ProductVectorCache(max_entries=0)
+    cache.put("a", [1.0])
+    assert len(cache) == 0
@@ -0,0 +1,40 @@
+"""Cross-process lease locks stored in MongoDB (one runner across uvicorn workers)"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from config.database import get_sync_db
+
+LOCKS_COLLECTION = "locks"
+
+
+def acquire_lock(name: str, ttl_seconds: int) -> Optional[str]:
+    """
+    Take the named lock for ttl_seconds unless another holder's lease is live.
+
+    Returns an owner token to pass to release_lock(), or None when the lock
+    is held elsewhere. An expired lease is taken over, so a crashed holder
+    cannot block the job forever.
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    try:
+        # Matches only a missing or expired lock; a live one makes the upsert
+        # collide on _id instead
+        get_sync_db()[LOCKS_COLLECTION].update_one(
+            {"_id": name, "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return None
+    return owner
+
+
+def release_lock(name: str, owner: str) -> None:
+    """Release the named lock if `owner` still holds it"""
+    get_sync_db()[LOCKS_COLLECTION].delete_one({"_id": name, "owner": owner})
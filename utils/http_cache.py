@@ -0,0 +1,33 @@
+"""Helpers for HTTP-level caching (Cache-Control + ETag) of JSON responses"""
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def cached_json_response(
+    request: Request,
+    payload: Any,
+    max_age: int = 60,
+    s_maxage: int = 300,
+) -> Response:
+    """
+    Serialize payload to JSON and attach Cache-Control and a content-hashed ETag.
+
+    Returns 304 Not Modified when the client's If-None-Match matches, so
+    browsers and CDNs can revalidate without re-downloading the body.
+    """
+    body = orjson.dumps(jsonable_encoder(payload))
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, s-maxage={s_maxage}",
+        "ETag": etag,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,56 @@
+"""Resized WebP derivatives for uploaded images (generated with libvips)"""
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (256, 512, 1024)
+
+
+@lru_cache(maxsize=1)
+def _pyvips():
+    """The pyvips module, or None when it (or libvips itself) is unavailable"""
+    try:
+        import pyvips
+    except (ImportError, OSError):
+        logger.warning("[UPLOAD] pyvips not available, image variants disabled")
+        return None
+    return pyvips
+
+
+def variants_available() -> bool:
+    """Whether generate_variants can actually write derivatives"""
+    return _pyvips() is not None
+
+
+def variant_path(path: Path, width: int) -> Path:
+    """Path of the WebP derivative of `path` at the given width"""
+    return path.with_name(f"{path.stem}.{width}.webp")
+
+
+def variant_urls(path: Path) -> Dict[str, str]:
+    """Public URLs of the derivatives that generate_variants will write"""
+    return {str(width): f"/{variant_path(path, width).as_posix()}" for width in VARIANT_WIDTHS}
+
+
+def generate_variants(path: Path) -> None:
+    """
+    Write resized WebP copies of an image next to the original.
+
+    Meant to run as a background task. pyvips is optional: without it the
+    original upload is still served and no derivatives are produced.
+    """
+    pyvips = _pyvips()
+    if pyvips is None:
+        return
+
+    for width in VARIANT_WIDTHS:
+        try:
+            # thumbnail() decodes with shrink-on-load and streams the pixels,
+            # so peak memory stays at a few tiles even for large originals
+            thumb = pyvips.Image.thumbnail(str(path), width, size="down")
+            thumb.write_to_file(str(variant_path(path, width)), Q=80, strip=True)
+        except Exception as e:
+            logger.error("[UPLOAD] Failed to create %spx variant for %s: %s", width, path, e)
@@ -1,4 +1,5 @@
 """Helper functions to serialize order nested objects to dictionaries"""
+import orjson
 
 
 def serialize_order_item(item):
@@ -54,3 +55,15 @@ def serialize_order(order):
         "createdAt": order.created_at,
         "updatedAt": order.updated_at
     }
+
+
+async def orders_json(orders) -> bytes:
+    """Serialize orders into one JSON array with orjson
+
+    The array is built in full before anything is sent, so a cursor error
+    surfaces as an error status instead of a truncated 200 body.
+
+    Args:
+        orders: Async iterable of Order documents (e.g. a Beanie find query)
+    """
+    return orjson.dumps([serialize_order(order) async for order in orders])